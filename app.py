@@ -1,12 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 import os
 import asyncio
-from datetime import datetime
-import pytz
-import json 
 
 # Import routers
 from routers.auth_router import router as auth_router
@@ -15,19 +14,19 @@ from routers.candidate_router import router as candidate_router
 from routers.hr_router import router as hr_router
 from routers.oa_router import router as oa_router
 
-# Custom JSON encoder for IST timezone
-class ISTJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            ist_tz = pytz.timezone('Asia/Kolkata')
-            if obj.tzinfo is None:
-                obj = ist_tz.localize(obj)
-            else:
-                obj = obj.astimezone(ist_tz)
-            return obj.isoformat()
-        return super().default(obj)
+# Static assets aren't content-hashed, so cache for a day rather than immutably
+STATIC_CACHE_CONTROL = "public, max-age=86400"
 
-app = FastAPI(title="Global Hiring Agent API", version="1.0.0")
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache public assets."""
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+
+
+app = FastAPI(title="Global Hiring Agent API", version="1.0.0", default_response_class=ORJSONResponse)
 
 
 
@@ -40,12 +39,22 @@ async def startup_event():
         print("APScheduler started successfully")
     except Exception as e:
         print(f"Failed to start APScheduler: {e}")
-    
+
+    try:
+        from db_manager import db_manager
+        # Connect now so the first request doesn't pay connection setup
+        if await db_manager.health_check():
+            await db_manager.warm_pool()
+            print("Database connection established")
+        await db_manager.ensure_indexes()
+        print("Database indexes ensured")
+    except Exception as e:
+        print(f"Failed to ensure database indexes: {e}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Cleanup APScheduler on app shutdown."""
+    """Cleanup APScheduler and the email sender on app shutdown."""
     try:
         from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import stop_scheduler
         stop_scheduler()
@@ -53,15 +62,27 @@ async def shutdown_event():
     except Exception as e:
         print(f"Error stopping APScheduler: {e}")
 
+    try:
+        from workflow.email_notifications.email_workflow import close_email_sender
+        await close_email_sender()
+    except Exception as e:
+        print(f"Error closing email sender: {e}")
+
+# Comma-separated list of allowed origins; defaults to any origin for local development.
+# Credentials are allowed, so production deployments should set explicit origins.
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
-app.mount("/public", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "public")), name="public")
+app.mount("/public", CachedStaticFiles(directory=os.path.join(os.path.dirname(__file__), "public")), name="public")
 
 # Include routers
 app.include_router(auth_router)
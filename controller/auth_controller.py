@@ -4,12 +4,46 @@ Handles user signup, login, and authentication-related operations.
 """
 
 import asyncio
+import hmac
+import bcrypt
 from fastapi import HTTPException
 from pydantic import BaseModel, EmailStr
 from db_schema import Candidate
 from db_manager import db_manager
 from bson import ObjectId
 import pymongo.errors
+from middleware.db_retry import with_db_retry
+
+
+# bcrypt only uses the first 72 bytes of a password (bcrypt>=5 raises on longer input)
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+
+def hash_password(password: str) -> str:
+    """Return a salted bcrypt hash for a password."""
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt()).decode("ascii")
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Check a password against a stored bcrypt hash."""
+    try:
+        return bcrypt.checkpw(_password_bytes(password), hashed.encode("ascii"))
+    except ValueError:
+        # Malformed hash
+        return False
+
+
+def is_password_hash(stored: str) -> bool:
+    """True for bcrypt hashes, False for legacy plaintext passwords."""
+    return stored.startswith(("$2a$", "$2b$", "$2y$")) and len(stored) == 60
+
+
+# Hash checked against when the email is unknown, so those logins cost the same as real ones
+_DUMMY_HASH = hash_password("")
 
 
 # Pydantic models for request/response bodies
@@ -31,49 +65,65 @@ class UserDB(BaseModel):
     candidate_id: str | None = None
 
 
+@with_db_retry()
 async def handle_signup(user_data: UserCreate):
     """Handle user signup and create candidate record."""
-    for attempt in range(3):
-        try:
-            candidates_collection = await db_manager.get_collection("candidate")
-
-            existing = await candidates_collection.find_one({"email": user_data.email})
-            if existing:
-                raise HTTPException(status_code=400, detail="Email already registered")
-
-            candidate_state = Candidate(
-                name=user_data.name,
-                email=user_data.email,
-                password=user_data.password,
-                role=user_data.role,
-            )
-            result = await candidates_collection.insert_one(candidate_state.dict())
-            return {"message": "User created successfully", "candidate_id": str(result.inserted_id)}
-            
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+    candidates_collection = db_manager.get_collection("candidate")
 
+    candidate_state = Candidate(
+        name=user_data.name,
+        email=user_data.email,
+        # bcrypt is CPU-bound; keep it off the event loop
+        password=await asyncio.to_thread(hash_password, user_data.password),
+        role=user_data.role,
+    )
+    try:
+        result = await candidates_collection.insert_one(candidate_state.model_dump())
+    except pymongo.errors.DuplicateKeyError:
+        # Unique index on candidate.email rejects duplicate signups
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return {"message": "User created successfully", "candidate_id": str(result.inserted_id)}
 
+
+@with_db_retry()
 async def handle_login(user_data: UserLogin) -> UserDB:
     """Handle user login and return user data."""
-    for attempt in range(3):
-        try:
-            candidates_collection = await db_manager.get_collection("candidate")
-            candidate = await candidates_collection.find_one({"email": user_data.email})
-            
-            if candidate and user_data.password == candidate.get("password"):
-                cid = str(candidate.get("_id")) if isinstance(candidate.get("_id"), ObjectId) else str(candidate.get("_id"))
-                role = candidate.get("role") or "candidate"
-                return UserDB(email=candidate.get("email"), role=role, candidate_id=cid)
-            
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-            
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+    candidates_collection = db_manager.get_collection("candidate")
+    candidate = await candidates_collection.find_one(
+        {"email": user_data.email},
+        projection={"_id": 1, "email": 1, "role": 1, "password": 1}
+    )
+    
+    if not candidate:
+        # Burn the same time as a real verify so unknown emails aren't distinguishable
+        await asyncio.to_thread(verify_password, user_data.password, _DUMMY_HASH)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    if await _verify_password(candidates_collection, candidate, user_data.password):
+        cid = str(candidate.get("_id")) if isinstance(candidate.get("_id"), ObjectId) else str(candidate.get("_id"))
+        role = candidate.get("role") or "candidate"
+        return UserDB(email=candidate.get("email"), role=role, candidate_id=cid)
+    
+    raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+async def _verify_password(candidates_collection, candidate: dict, password: str) -> bool:
+    """Check a login password, upgrading legacy plaintext passwords to a hash on success."""
+    stored = candidate.get("password")
+    if not stored:
+        return False
+    if is_password_hash(stored):
+        return await asyncio.to_thread(verify_password, password, stored)
+    
+    # Legacy record stored before hashing was introduced
+    if not hmac.compare_digest(password.encode(), stored.encode()):
+        return False
+    hashed = await asyncio.to_thread(hash_password, password)
+    await candidates_collection.update_one(
+        {"_id": candidate["_id"]},
+        {"$set": {"password": hashed}}
+    )
+    return True
 
 
 async def handle_create_candidate(candidate: Candidate):
@@ -3,66 +3,47 @@ Controller for candidate profile functionality.
 Handles all business logic related to candidate profile management.
 """
 
-import asyncio
 from fastapi import HTTPException
-from bson import ObjectId
 from db_manager import db_manager
 from db_schema import Candidate
 from middleware.auth_middleware import User
 from typing import Union, Any
-import pymongo.errors
+from middleware.db_retry import with_db_retry
+from middleware.validation import to_object_id
 
 
+@with_db_retry()
 async def get_candidate_profile(candidate_id: str, user: User):
     """Get candidate/user profile information."""
     
-    for attempt in range(3):
-        try:
-            candidates = await db_manager.get_collection("candidate")
-            try:
-                doc = await candidates.find_one({"_id": ObjectId(candidate_id)})
-            except Exception:
-                raise HTTPException(status_code=400, detail="Invalid user id")
-            
-            if not doc:
-                raise HTTPException(status_code=404, detail="User not found")
-            
-            doc["_id"] = str(doc["_id"])  # serialize id
-            # Avoid exposing password and temp resume text
-            if "password" in doc:
-                del doc["password"]
-            if "temp_resume_text" in doc:
-                del doc["temp_resume_text"]
-            
-            return doc
-            
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+    oid = to_object_id(candidate_id, "Invalid user id")
+    candidates = db_manager.get_collection("candidate")
+    # Avoid exposing password and temp resume text
+    doc = await candidates.find_one(
+        {"_id": oid},
+        projection={"password": 0, "temp_resume_text": 0}
+    )
+    
+    if not doc:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    doc["_id"] = str(doc["_id"])  # serialize id
+    
+    return doc
 
 
+@with_db_retry()
 async def update_candidate_profile(candidate_id: str, payload: Any, user: User):
     """Update candidate/user profile information."""
     
-    for attempt in range(3):
-        try:
-            candidates = await db_manager.get_collection("candidate")
-            try:
-                oid = ObjectId(candidate_id)
-            except Exception:
-                raise HTTPException(status_code=400, detail="Invalid user id")
+    oid = to_object_id(candidate_id, "Invalid user id")
+    candidates = db_manager.get_collection("candidate")
 
-            update_fields = {}
-            if hasattr(payload, 'name') and payload.name is not None:
-                update_fields["name"] = payload.name
-            if not update_fields:
-                raise HTTPException(status_code=400, detail="No updatable fields provided")
+    update_fields = {}
+    if hasattr(payload, 'name') and payload.name is not None:
+        update_fields["name"] = payload.name
+    if not update_fields:
+        raise HTTPException(status_code=400, detail="No updatable fields provided")
 
-            await candidates.update_one({"_id": oid}, {"$set": update_fields})
-            return {"message": "Profile updated"}
-            
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+    await candidates.update_one({"_id": oid}, {"$set": update_fields})
+    return {"message": "Profile updated"}
@@ -6,12 +6,33 @@ Handles OA page display, date validation, and score submission.
 # Configuration: Hours before OA deadline when test window opens
 OA_WINDOW_HOURS = 24
 
+# Configuration: Most processes kept in each OA window cache
+WINDOW_CACHE_MAXSIZE = 512
+
+# Configuration: Seconds a rendered closed-window page is reused (capped at the next window boundary)
+WINDOW_PAGE_CACHE_SECONDS = 30
+
+# Configuration: How long an ended OA window is remembered for stale links
+WINDOW_CACHE_RETENTION_DAYS = 7
+
 from fastapi import HTTPException
 from fastapi.responses import HTMLResponse
-from datetime import datetime, date
-from typing import Dict, Any
+from datetime import datetime, date, timedelta, timezone
+from typing import Dict, Any, Optional, Tuple
 from db_manager import db_manager
 from bson import ObjectId
+from pymongo import ReturnDocument
+from workflow.process_cache import get_process, invalidate_process
+from middleware.response_cache import invalidate_process_responses
+import os
+import pytz
+
+IST_TZ = pytz.timezone('Asia/Kolkata')
+WINDOW_CACHE_RETENTION = timedelta(days=WINDOW_CACHE_RETENTION_DAYS)
+
+# OA page is static; read it once instead of on every request
+with open(os.path.join(os.path.dirname(__file__), "..", "views", "online_assessment.html"), "r") as f:
+    _OA_HTML = f.read()
 
 
 # Correct answers for the Python quiz
@@ -22,6 +43,118 @@ CORRECT_ANSWERS = {
     "q4": "B",  # def
     "q5": "B"   # 6
 }
+CORRECT_ITEMS = frozenset(CORRECT_ANSWERS.items())
+
+# process_id -> (expires at, closed-window HTML or None when open)
+_window_page_cache: Dict[str, Any] = {}
+
+# process_id -> (oa_start, oa_end); lets expired links skip MongoDB entirely
+_window_cache: Dict[str, Tuple[datetime, datetime]] = {}
+
+
+def invalidate_process_cache(process_id: str):
+    """Drop a cached process and its OA windows; call after HR edits or deletes it."""
+    invalidate_process(process_id)
+    _window_page_cache.pop(process_id, None)
+    _window_cache.pop(process_id, None)
+
+
+def _oa_window(process_data: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+    """Return the (start, end) of the OA window in IST, or None if not scheduled."""
+    # OA is active from assessment_date - OA_WINDOW_HOURS to assessment_date
+    assessment_date = process_data.get("assessment_date")
+    if not assessment_date:
+        return None
+    
+    if assessment_date.tzinfo is None:
+        assessment_date = IST_TZ.localize(assessment_date)
+    
+    return assessment_date - timedelta(hours=OA_WINDOW_HOURS), assessment_date
+
+
+def _cached_closed_window(process_id: str, now: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """Return the cached window if it has already ended, evicting stale entries."""
+    window = _window_cache.get(process_id)
+    if not window or now <= window[1]:
+        return None
+    if now > window[1] + WINDOW_CACHE_RETENTION:
+        del _window_cache[process_id]
+        return None
+    return window
+
+
+async def _load_window(process_id: str) -> Optional[Tuple[datetime, datetime]]:
+    """Fetch the process and remember its OA window; raises 404 if missing."""
+    process_data = await get_process(process_id)
+    if not process_data:
+        raise HTTPException(status_code=404, detail="Process not found")
+    
+    window = _oa_window(process_data)
+    if window:
+        if len(_window_cache) >= WINDOW_CACHE_MAXSIZE:
+            _window_cache.clear()
+        _window_cache[process_id] = window
+    return window
+
+
+def _render_window_page(window: Optional[Tuple[datetime, datetime]], now: datetime) -> Optional[str]:
+    """Return the HTML shown outside the OA window, or None while the window is open."""
+    if window is None:
+        return """
+        <html><body style="text-align:center; padding:50px; font-family:Arial;">
+            <h2>Assessment Not Scheduled</h2>
+            <p>The assessment date has not been set yet.</p>
+            <p>Please contact HR for more information.</p>
+        </body></html>
+        """
+    
+    oa_start, oa_end = window
+    if now < oa_start:
+        return f"""
+        <html><body style="text-align:center; padding:50px; font-family:Arial;">
+            <h2>Online Assessment Not Available</h2>
+            <p>The assessment will be available from: <strong>{oa_start.strftime('%Y-%m-%d %H:%M IST')}</strong></p>
+            <p>Assessment window: {oa_start.strftime('%H:%M')} to {oa_end.strftime('%H:%M IST')}</p>
+        </body></html>
+        """
+    elif now > oa_end:
+        return f"""
+        <html><body style="text-align:center; padding:50px; font-family:Arial;">
+            <h2>Assessment Expired</h2>
+            <p>The assessment window was: <strong>{oa_start.strftime('%Y-%m-%d %H:%M')} to {oa_end.strftime('%H:%M IST')}</strong></p>
+            <p>Results will be communicated via email.</p>
+        </body></html>
+        """
+    
+    return None
+
+
+async def _get_window_page(process_id: str) -> Optional[str]:
+    """Closed-window page for a process, memoized for WINDOW_PAGE_CACHE_SECONDS but never past a window boundary."""
+    now = datetime.now(IST_TZ)
+    
+    # Expired windows never reopen, so answer stale links without any lookup
+    window = _cached_closed_window(process_id, now)
+    if window:
+        return _render_window_page(window, now)
+    
+    cached = _window_page_cache.get(process_id)
+    if cached and now < cached[0]:
+        return cached[1]
+    
+    window = await _load_window(process_id)
+    window_page = _render_window_page(window, now)
+    
+    # Expire at the next opening/closing time so the page flips exactly on schedule
+    expires_at = now + timedelta(seconds=WINDOW_PAGE_CACHE_SECONDS)
+    for boundary in window or ():
+        if now < boundary:
+            expires_at = min(expires_at, boundary)
+    
+    if len(_window_page_cache) >= WINDOW_CACHE_MAXSIZE:
+        _window_page_cache.clear()
+    _window_page_cache[process_id] = (expires_at, window_page)
+    return window_page
 
 
 async def get_oa_page(candidate_id: str, process_id: str) -> HTMLResponse:
@@ -30,60 +163,21 @@ async def get_oa_page(candidate_id: str, process_id: str) -> HTMLResponse:
     URL format: /candidate_id/OA/process_id
     """
     try:
-        # Get process data to check assessment timing
-        processes = await db_manager.get_collection("Processes")
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
-        
-        if not process_data:
-            raise HTTPException(status_code=404, detail="Process not found")
-        
-        # Check if OA is currently active (assessment_date - OA_WINDOW_HOURS to assessment_date)
-        assessment_date = process_data.get("assessment_date")
-        if assessment_date:
-            from datetime import timedelta
-            import pytz
-            
-            ist_tz = pytz.timezone('Asia/Kolkata')
-            now = datetime.now(ist_tz)
-            
-            if assessment_date.tzinfo is None:
-                assessment_date = ist_tz.localize(assessment_date)
-            
-            oa_start = assessment_date - timedelta(hours=OA_WINDOW_HOURS)
-            oa_end = assessment_date
-            
-            if now < oa_start:
-                return HTMLResponse(f"""
-                <html><body style="text-align:center; padding:50px; font-family:Arial;">
-                    <h2>Online Assessment Not Available</h2>
-                    <p>The assessment will be available from: <strong>{oa_start.strftime('%Y-%m-%d %H:%M IST')}</strong></p>
-                    <p>Assessment window: {oa_start.strftime('%H:%M')} to {oa_end.strftime('%H:%M IST')}</p>
-                </body></html>
-                """)
-            elif now > oa_end:
-                return HTMLResponse(f"""
-                <html><body style="text-align:center; padding:50px; font-family:Arial;">
-                    <h2>Assessment Expired</h2>
-                    <p>The assessment window was: <strong>{oa_start.strftime('%Y-%m-%d %H:%M')} to {oa_end.strftime('%H:%M IST')}</strong></p>
-                    <p>Results will be communicated via email.</p>
-                </body></html>
-                """)
-        else:
-            return HTMLResponse("""
-            <html><body style="text-align:center; padding:50px; font-family:Arial;">
-                <h2>Assessment Not Scheduled</h2>
-                <p>The assessment date has not been set yet.</p>
-                <p>Please contact HR for more information.</p>
-            </body></html>
-            """)
+        # Closed-window pages are shared by every candidate of the process
+        window_page = await _get_window_page(process_id)
+        if window_page is not None:
+            return HTMLResponse(window_page)
         
         # Validate candidate and process
-        applications = await db_manager.get_collection("applications")
-        application = await applications.find_one({
-            "candidate_id": candidate_id,
-            "process_id": process_id,
-            "status": "Resume_shortlisted"
-        })
+        applications = db_manager.get_collection("applications")
+        application = await applications.find_one(
+            {
+                "candidate_id": candidate_id,
+                "process_id": process_id,
+                "status": "Resume_shortlisted"
+            },
+            projection={"oa_score": 1, "status": 1}
+        )
         
         if not application:
             raise HTTPException(status_code=404, detail="Application not found or not eligible for OA")
@@ -98,12 +192,11 @@ async def get_oa_page(candidate_id: str, process_id: str) -> HTMLResponse:
             </body></html>
             """)
         
-        # Load and return the OA page
-        with open("views/online_assessment.html", "r") as f:
-            html_content = f.read()
-        
-        return HTMLResponse(content=html_content)
+        # Return the cached OA page
+        return HTMLResponse(content=_OA_HTML, headers={"Cache-Control": "private, max-age=300"})
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading OA page: {str(e)}")
 
@@ -113,65 +206,54 @@ async def submit_oa_answers(candidate_id: str, process_id: str, answers: Dict[st
     Process OA submission and calculate score.
     """
     try:
+        if not ObjectId.is_valid(process_id):
+            return {"success": False, "message": "Invalid process id"}
+        
         # Validate timing again
-        processes = await db_manager.get_collection("Processes")
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
+        now = datetime.now(IST_TZ)
+        if _cached_closed_window(process_id, now):
+            return {"success": False, "message": "Assessment window has closed"}
         
-        if not process_data:
+        try:
+            window = await _load_window(process_id)
+        except HTTPException:
             return {"success": False, "message": "Process not found"}
         
-        assessment_date = process_data.get("assessment_date")
-        if assessment_date:
-            from datetime import timedelta
-            import pytz
-            
-            ist_tz = pytz.timezone('Asia/Kolkata')
-            now = datetime.now(ist_tz)
-            
-            if assessment_date.tzinfo is None:
-                assessment_date = ist_tz.localize(assessment_date)
-            
-            oa_start = assessment_date - timedelta(hours=OA_WINDOW_HOURS)
-            oa_end = assessment_date
-            
+        if window:
+            oa_start, oa_end = window
             if now < oa_start or now > oa_end:
                 return {"success": False, "message": "Assessment window has closed"}
         
-        # Validate application
-        applications = await db_manager.get_collection("applications")
-        application = await applications.find_one({
-            "candidate_id": candidate_id,
-            "process_id": process_id,
-            "status": "Resume_shortlisted"
-        })
-        
-        if not application:
-            return {"success": False, "message": "Application not found or not eligible"}
-        
-        if application.get("oa_score") is not None:
-            return {"success": False, "message": "Assessment already completed"}
-        
         # Calculate score
-        correct_count = 0
+        correct_count = len(CORRECT_ITEMS & answers.items())
         total_questions = len(CORRECT_ANSWERS)
-        
-        for question, correct_answer in CORRECT_ANSWERS.items():
-            if answers.get(question) == correct_answer:
-                correct_count += 1
-        
         score = int((correct_count / total_questions) * 100)
         
+        # Validate application and save score atomically; the oa_score filter
+        # rejects a second submission racing the first one.
         # Only save score, don't change status yet (wait for OA deadline job)
-        await applications.update_one(
-            {"candidate_id": candidate_id, "process_id": process_id},
+        applications = db_manager.get_collection("applications")
+        application = await applications.find_one_and_update(
+            {
+                "candidate_id": candidate_id,
+                "process_id": process_id,
+                "status": "Resume_shortlisted",
+                "oa_score": None
+            },
             {
                 "$set": {
                     "oa_score": score,
-                    "updated_at": datetime.now()
+                    "updated_at": datetime.now(timezone.utc)
                 }
-            }
+            },
+            projection={"_id": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
+        if application is None:
+            return {"success": False, "message": "Application not found, not eligible, or assessment already completed"}
+        await invalidate_process_responses(process_id)
+        
         # Don't send email notification immediately - will be handled by scheduler
         
         return {
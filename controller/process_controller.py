@@ -6,62 +6,118 @@ Handles all business logic related to hiring processes, shortlisting, and proces
 import os
 import asyncio
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import HTTPException
 from db_manager import db_manager
 from db_schema import HiringProcess
+from middleware.db_retry import TRANSIENT_DB_ERRORS
+from middleware.validation import to_object_id
+from middleware.aggregation import with_candidate_pipeline
+from controller.oa_controller import invalidate_process_cache
 from bson import ObjectId
 from openai import OpenAI
-import pymongo.errors
-
-
-
+from pymongo import UpdateOne
+import pytz
+from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import scheduler, schedule_process, unschedule_process
+
+IST = pytz.timezone('Asia/Kolkata')
+
+# Max operations sent per bulk_write round-trip
+BULK_WRITE_BATCH_SIZE = 500
+
+# Largest page a caller may ask for; without a limit the whole list is returned,
+# since the HR dashboard and resume page have no paging UI
+LIST_PROCESSES_MAX_LIMIT = 200
+
+# Process fields returned by list_hiring_processes (the list views never need hr_email)
+LIST_PROCESS_FIELDS = ("process_name", "job_description", "hr_id", "company_id", "resume_deadline",
+                       "assessment_date", "offline_interview_date", "package_offered")
+
+# Score field -> weight in the final combined score, and the selection cut-off
+FINAL_SCORE_WEIGHTS = {"oa_score": 0.4, "tech_score": 0.3, "hr_score": 0.3}
+FINAL_SELECTION_THRESHOLD = 70
+
+# Result lists returned by get_process_detail, in response order
+PROCESS_DETAIL_BUCKETS = ("application", "shortlisted", "oa_shortlisted", "oa_rejected", "final_shortlisted")
+
+# Application status -> get_process_detail bucket (None = not shown)
+STATUS_BUCKETS = {
+    "Applied": "application",
+    "Resume_shortlisted": "shortlisted",
+    "Resume_rejected": None,
+    "OA_cleared": "oa_shortlisted",
+    "OA_rejected": "oa_rejected",
+    "Final_selected": "final_shortlisted",
+    "Final_rejected": None,
+}
+
+# Statuses for which the OA score has been processed and can be shown
+OA_SCORE_VISIBLE_STATUSES = frozenset(["OA_cleared", "OA_rejected", "Final_selected", "Final_rejected"])
+
+
+async def load_process_check_deadline(process_id: str, deadline_field: str, label: str) -> dict:
+    """Fetch a process's deadline field and raise HTTP 400 if that deadline has passed."""
+    processes = db_manager.get_collection("Processes")
+    proc = await processes.find_one(
+        {"_id": to_object_id(process_id, "Invalid process id")},
+        projection={deadline_field: 1}
+    )
+    if not proc:
+        raise HTTPException(status_code=404, detail="Process not found")
+    
+    deadline = proc.get(deadline_field)
+    if deadline:
+        if deadline.tzinfo is None:
+            deadline = IST.localize(deadline)
+        if datetime.now(IST) > deadline:
+            raise HTTPException(status_code=400, detail=f"{label} deadline has passed")
+    return proc
 
 
 async def create_hiring_process(process: HiringProcess):
     """Create a new hiring process and schedule deadline."""
-    for attempt in range(3):
-        try:
-            processes = await db_manager.get_collection("Processes")
-            doc = process.dict()
-            
-
-            
-            result = await processes.insert_one(doc)
-            process_id = str(result.inserted_id)
-            
-            # Auto-schedule jobs for this process
-            try:
-                from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import schedule_process
-                doc["_id"] = result.inserted_id
-                await schedule_process(doc)
-                print(f"Auto-scheduled jobs for process {process_id}")
-            except Exception as e:
-                print(f"Failed to auto-schedule jobs: {e}")
-            
-            return {"process_id": process_id}
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+    # Transient failures are retried by the driver (retryWrites); only its final error lands here
+    try:
+        processes = db_manager.get_collection("Processes")
+        doc = process.model_dump()
+        
+        result = await processes.insert_one(doc)
+        process_id = str(result.inserted_id)
+    except TRANSIENT_DB_ERRORS:
+        raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
+    
+    # Auto-schedule jobs for this process
+    try:
+        doc["_id"] = result.inserted_id
+        await schedule_process(doc)
+        print(f"Auto-scheduled jobs for process {process_id}")
+    except Exception as e:
+        print(f"Failed to auto-schedule jobs: {e}")
+    
+    return {"process_id": process_id}
 
 
-async def list_hiring_processes(hr_id: Optional[str] = None) -> List[dict]:
-    """List all hiring processes, optionally filtered by HR ID."""
-    for attempt in range(3):
-        try:
-            processes = await db_manager.get_collection("Processes")
-            query = {"hr_id": hr_id} if hr_id else {}
-            cursor = processes.find(query)
-            items = []
-            async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                items.append(doc)
-            return items
-        except (pymongo.errors.NetworkTimeout, pymongo.errors.ServerSelectionTimeoutError) as e:
-            if attempt == 2:
-                raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
-            await asyncio.sleep(1)
+async def list_hiring_processes(hr_id: Optional[str] = None, skip: int = 0, limit: Optional[int] = None) -> List[dict]:
+    """List hiring processes newest first, optionally filtered by HR ID and paged with skip/limit."""
+    # Transient failures are retried by the driver (retryReads); only its final error lands here
+    try:
+        processes = db_manager.get_collection("Processes")
+        query = {"hr_id": hr_id} if hr_id else {}
+        # Newest first via _id (served by the (hr_id, _id) index); stringify ids server-side
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"_id": -1}},
+            {"$skip": skip}
+        ]
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        pipeline += [
+            {"$project": {field: 1 for field in LIST_PROCESS_FIELDS}},
+            {"$set": {"_id": {"$toString": "$_id"}}}
+        ]
+        return await processes.aggregate(pipeline).to_list(length=None)
+    except TRANSIENT_DB_ERRORS:
+        raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
 
 
 async def shortlist_process_candidates(process_id: str):
@@ -70,27 +126,11 @@ async def shortlist_process_candidates(process_id: str):
     This endpoint delegates to the workflow instead of doing scoring directly.
     """
     try:
-        import pytz
-        
         # Check if deadline has passed
-        processes = await db_manager.get_collection("Processes")
-        proc = await processes.find_one({"_id": ObjectId(process_id)})
-        if not proc:
-            raise HTTPException(status_code=404, detail="Process not found")
-        
-        ist_tz = pytz.timezone('Asia/Kolkata')
-        now = datetime.now(ist_tz)
-        resume_deadline = proc.get("resume_deadline")
-        
-        if resume_deadline:
-            if resume_deadline.tzinfo is None:
-                resume_deadline = ist_tz.localize(resume_deadline)
-            if now > resume_deadline:
-                raise HTTPException(status_code=400, detail="Resume deadline has passed")
+        await load_process_check_deadline(process_id, "resume_deadline", "Resume")
         
         # Cancel all scheduled jobs for this process
         try:
-            from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import scheduler
             scheduler.remove_job(f"resume_{process_id}")
             scheduler.remove_job(f"oa_{process_id}")
             scheduler.remove_job(f"interview_{process_id}")
@@ -122,11 +162,16 @@ async def shortlist_process_candidates(process_id: str):
 async def sync_application_status(process_id: str):
     """Manually sync application statuses based on scores"""
     try:
-        applications = await db_manager.get_collection("applications")
+        applications = db_manager.get_collection("applications")
         
         # Find all applications for this process that have scores but wrong status
-        cursor = applications.find({"process_id": process_id, "resume_match_score": {"$exists": True}})
+        cursor = applications.find(
+            {"process_id": process_id, "resume_match_score": {"$exists": True}},
+            projection={"_id": 1, "resume_match_score": 1, "status": 1}
+        )
         updated_count = 0
+        now = datetime.now(timezone.utc)
+        ops = []
         
         async for app in cursor:
             score = app.get("resume_match_score", 0)
@@ -135,16 +180,20 @@ async def sync_application_status(process_id: str):
             # Determine correct status based on score
             correct_status = "Resume_shortlisted" if score >= 50 else "Resume_rejected"
             
-            # Update if status is wrong
+            # Queue an update if status is wrong
             if current_status != correct_status:
-                await applications.update_one(
+                ops.append(UpdateOne(
                     {"_id": app["_id"]},
-                    {"$set": {
-                        "status": correct_status,
-                        "updated_at": datetime.now()
-                    }}
-                )
-                updated_count += 1
+                    {"$set": {"status": correct_status, "updated_at": now}}
+                ))
+                if len(ops) >= BULK_WRITE_BATCH_SIZE:
+                    result = await applications.bulk_write(ops, ordered=False)
+                    updated_count += result.modified_count
+                    ops = []
+        
+        if ops:
+            result = await applications.bulk_write(ops, ordered=False)
+            updated_count += result.modified_count
         
         return {
             "message": "Status sync completed",
@@ -158,8 +207,8 @@ async def sync_application_status(process_id: str):
 async def delete_hiring_process(process_id: str):
     """Delete a hiring process and all related applications."""
     try:
-        processes = await db_manager.get_collection("Processes")
-        applications = await db_manager.get_collection("applications")
+        processes = db_manager.get_collection("Processes")
+        applications = db_manager.get_collection("applications")
         
         # Delete all applications for this process
         await applications.delete_many({"process_id": process_id})
@@ -170,9 +219,10 @@ async def delete_hiring_process(process_id: str):
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Process not found")
         
+        invalidate_process_cache(process_id)
+        
         # Unschedule from APScheduler
         try:
-            from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import unschedule_process
             unschedule_process(process_id)
         except Exception as e:
             print(f"Failed to unschedule process: {e}")
@@ -187,93 +237,62 @@ async def delete_hiring_process(process_id: str):
 
 async def get_process_detail(process_id: str) -> dict:
     """Get detailed information about a specific hiring process including candidate statuses."""
-    processes = await db_manager.get_collection("Processes")
-    candidates = await db_manager.get_collection("candidate")
-    applications = await db_manager.get_collection("applications")
+    oid = to_object_id(process_id, "Invalid process id")
+    processes = db_manager.get_collection("Processes")
+    applications = db_manager.get_collection("applications")
     
-    try:
-        proc = await processes.find_one({"_id": ObjectId(process_id)})
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid process id")
+    # The process and its applications are independent reads; run them together
+    pipeline = with_candidate_pipeline(
+        {"process_id": process_id},
+        ("status", "resume_match_score", "oa_score", "tech_score", "hr_score")
+    )
+    proc, apps = await asyncio.gather(
+        processes.find_one({"_id": oid}),
+        applications.aggregate(pipeline).to_list(None)
+    )
     
     if not proc:
         raise HTTPException(status_code=404, detail="Process not found")
     
     proc["_id"] = str(proc["_id"])
-    
-
 
     # Categorize candidates by status from applications
-    application = []
-    shortlisted = []
-    oa_shortlisted = []
-    oa_rejected = []
-    final_shortlisted = []
-
-    async for app in applications.find({"process_id": process_id}):
-        # Get candidate details
-        try:
-            cand = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
-            if not cand:
-                print(f"Candidate not found for ID: {app['candidate_id']}")
-                continue
-                
-            # Only show OA score if status has been processed (OA_cleared/OA_rejected/Final_selected/Final_rejected)
-            show_oa_score = app.get("status") in ["OA_cleared", "OA_rejected", "Final_selected", "Final_rejected"]
-            
-            row = {
-                "name": cand.get("name"), 
-                "email": cand.get("email"), 
-                "status": app.get("status"),
-                "resume_match_score": app.get("resume_match_score"),
-                "oa_score": app.get("oa_score") if show_oa_score else None,
-                "tech_score": app.get("tech_score"),
-                "hr_score": app.get("hr_score")
-            }
-            status = app.get("status", "Applied")
-            print(f"Processing candidate: {cand.get('email')} with status: {status}")
-            
-            if status == "Applied":
-                application.append(row)
-            elif status == "Resume_shortlisted":
-                shortlisted.append(row)
-            elif status == "Resume_rejected":
-                # Don't show resume rejected
-                pass
-            elif status == "OA_cleared":
-                oa_shortlisted.append(row)
-            elif status == "OA_rejected":
-                oa_rejected.append(row)
-            elif status == "Final_selected":
-                final_shortlisted.append(row)
-            elif status == "Final_rejected":
-                # Don't show final rejected
-                pass
-            else:
-                # Any other status goes to applications
-                application.append(row)
-        except Exception as e:
-            print(f"Error processing application: {e}")
+    buckets = {bucket: [] for bucket in PROCESS_DETAIL_BUCKETS}
+
+    for app in apps:
+        cand = app.get("candidate")
+        if not cand:
             continue
+        
+        status = app.get("status", "Applied")
+        # Any other status goes to applications; None means the status isn't shown
+        bucket = STATUS_BUCKETS.get(status, "application")
+        if bucket is None:
+            continue
+        
+        # Only show OA score if status has been processed
+        show_oa_score = app.get("status") in OA_SCORE_VISIBLE_STATUSES
+        
+        buckets[bucket].append({
+            "name": cand.get("name"), 
+            "email": cand.get("email"), 
+            "status": app.get("status"),
+            "resume_match_score": app.get("resume_match_score"),
+            "oa_score": app.get("oa_score") if show_oa_score else None,
+            "tech_score": app.get("tech_score"),
+            "hr_score": app.get("hr_score")
+        })
 
-    print(f"Final counts - Applications: {len(application)}, Shortlisted: {len(shortlisted)}, OA Shortlisted: {len(oa_shortlisted)}, Final: {len(final_shortlisted)}")
+    print(f"Final counts - Applications: {len(buckets['application'])}, Shortlisted: {len(buckets['shortlisted'])}, OA Shortlisted: {len(buckets['oa_shortlisted'])}, Final: {len(buckets['final_shortlisted'])}")
     
-    return {
-        "process": proc,
-        "application": application,
-        "shortlisted": shortlisted,
-        "oa_shortlisted": oa_shortlisted,
-        "oa_rejected": oa_rejected,
-        "final_shortlisted": final_shortlisted,
-    }
+    return {"process": proc, **buckets}
 
 
 async def get_oa_shortlisted_candidates(process_id: str) -> dict:
     """Get OA shortlisted candidates for HR scoring."""
     try:
-        processes = await db_manager.get_collection("Processes")
-        candidates = await db_manager.get_collection("candidate")
-        applications = await db_manager.get_collection("applications")
+        processes = db_manager.get_collection("Processes")
+        applications = db_manager.get_collection("applications")
         
         # Get process details
         proc = await processes.find_one({"_id": ObjectId(process_id)})
@@ -284,8 +303,12 @@ async def get_oa_shortlisted_candidates(process_id: str) -> dict:
         
         # Get OA cleared candidates
         oa_candidates = []
-        async for app in applications.find({"process_id": process_id, "status": "OA_cleared"}):
-            cand = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "status": "OA_cleared"},
+            ("oa_score", "tech_score", "hr_score", "status")
+        )
+        async for app in applications.aggregate(pipeline):
+            cand = app.get("candidate")
             if cand:
                 oa_candidates.append({
                     "candidate_id": app["candidate_id"],
@@ -309,21 +332,24 @@ async def get_oa_shortlisted_candidates(process_id: str) -> dict:
 async def save_hr_scores(process_id: str, scores: List[dict]) -> dict:
     """Save technical and HR scores for candidates."""
     try:
-        applications = await db_manager.get_collection("applications")
-        updated_count = 0
-        
-        for score_data in scores:
-            candidate_id = score_data["candidate_id"]
-            tech_score = score_data.get("tech_score", 0)
-            hr_score = score_data.get("hr_score", 0)
-            
-            result = await applications.update_one(
-                {"candidate_id": candidate_id, "process_id": process_id},
-                {"$set": {"tech_score": tech_score, "hr_score": hr_score, "updated_at": datetime.now()}}
+        applications = db_manager.get_collection("applications")
+        if not scores:
+            return {"updated_count": 0}
+        
+        now = datetime.now(timezone.utc)
+        ops = [
+            UpdateOne(
+                {"candidate_id": score_data["candidate_id"], "process_id": process_id},
+                {"$set": {
+                    "tech_score": score_data.get("tech_score", 0),
+                    "hr_score": score_data.get("hr_score", 0),
+                    "updated_at": now
+                }}
             )
-            
-            if result.modified_count > 0:
-                updated_count += 1
+            for score_data in scores
+        ]
+        result = await applications.bulk_write(ops, ordered=False)
+        updated_count = result.modified_count
         
         return {"updated_count": updated_count}
         
@@ -334,12 +360,14 @@ async def save_hr_scores(process_id: str, scores: List[dict]) -> dict:
 async def execute_final_shortlisting(process_id: str) -> dict:
     """Execute final shortlisting based on combined scores and send selection emails."""
     try:
-        processes = await db_manager.get_collection("Processes")
-        candidates = await db_manager.get_collection("candidate")
-        applications = await db_manager.get_collection("applications")
+        processes = db_manager.get_collection("Processes")
+        applications = db_manager.get_collection("applications")
         
         # Get process details
-        proc = await processes.find_one({"_id": ObjectId(process_id)})
+        proc = await processes.find_one(
+            {"_id": ObjectId(process_id)},
+            projection={"process_name": 1, "package_offered": 1}
+        )
         if not proc:
             raise HTTPException(status_code=404, detail="Process not found")
         
@@ -347,25 +375,31 @@ async def execute_final_shortlisting(process_id: str) -> dict:
         selected_candidates = []
         rejected_candidates = []
         
-        async for app in applications.find({"process_id": process_id, "status": "OA_cleared"}):
-            oa_score = app.get("oa_score", 0)
-            tech_score = app.get("tech_score", 0)
-            hr_score = app.get("hr_score", 0)
-            
-            # Calculate combined score (weighted average)
-            combined_score = (oa_score * 0.4) + (tech_score * 0.3) + (hr_score * 0.3)
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "status": "OA_cleared"},
+            ("oa_score", "tech_score", "hr_score")
+        )
+        # Calculate combined score (weighted average) server-side, missing scores count as 0
+        pipeline.append({"$addFields": {"combined_score": {"$add": [
+            {"$multiply": [{"$ifNull": [f"${field}", 0]}, weight]}
+            for field, weight in FINAL_SCORE_WEIGHTS.items()
+        ]}}})
+        apps = await applications.aggregate(pipeline).to_list(None)
+        
+        now = datetime.now(timezone.utc)
+        ops = []
+        for app in apps:
+            combined_score = app["combined_score"]
             
-            # Final selection threshold: 70
-            new_status = "Final_selected" if combined_score >= 70 else "Final_rejected"
+            new_status = "Final_selected" if combined_score >= FINAL_SELECTION_THRESHOLD else "Final_rejected"
             
-            # Update status
-            await applications.update_one(
+            ops.append(UpdateOne(
                 {"_id": app["_id"]},
-                {"$set": {"status": new_status, "updated_at": datetime.now()}}
-            )
+                {"$set": {"status": new_status, "updated_at": now}}
+            ))
             
-            # Get candidate details
-            cand = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
+            # Candidate details joined by the pipeline
+            cand = app.get("candidate")
             if cand:
                 candidate_data = {
                     "_id": app["candidate_id"],
@@ -380,8 +414,12 @@ async def execute_final_shortlisting(process_id: str) -> dict:
                 else:
                     rejected_candidates.append(candidate_data)
         
+        # Update all statuses in one round-trip
+        if ops:
+            await applications.bulk_write(ops, ordered=False)
+        
         # Send selection emails
-        from workflow.email_notifications.email_service import send_selection_notifications, send_hr_summary_email
+        from workflow.email_notifications.email_service import send_selection_notifications
         email_results = await send_selection_notifications(
             selected_candidates,
             rejected_candidates,
@@ -405,46 +443,11 @@ async def execute_final_shortlisting(process_id: str) -> dict:
 async def trigger_oa_workflow(process_id: str) -> dict:
     """Trigger OA workflow manually."""
     try:
-        from workflow.assessment_workflow import process_oa_deadline
-        result = await process_oa_deadline(process_id)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"OA workflow failed: {str(e)}")
-
-
-async def trigger_final_workflow(process_id: str) -> dict:
-    """Trigger final shortlisting workflow manually."""
-    try:
-        from workflow.final_shortlisting_workflow import process_interview_deadline
-        result = await process_interview_deadline(process_id)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Final workflow failed: {str(e)}")
-
-async def trigger_oa_workflow(process_id: str) -> dict:
-    """Trigger OA workflow manually."""
-    try:
-        import pytz
-        
         # Check if deadline has passed
-        processes = await db_manager.get_collection("Processes")
-        proc = await processes.find_one({"_id": ObjectId(process_id)})
-        if not proc:
-            raise HTTPException(status_code=404, detail="Process not found")
-        
-        ist_tz = pytz.timezone('Asia/Kolkata')
-        now = datetime.now(ist_tz)
-        assessment_date = proc.get("assessment_date")
-        
-        if assessment_date:
-            if assessment_date.tzinfo is None:
-                assessment_date = ist_tz.localize(assessment_date)
-            if now > assessment_date:
-                raise HTTPException(status_code=400, detail="Assessment deadline has passed")
+        await load_process_check_deadline(process_id, "assessment_date", "Assessment")
         
         # Cancel scheduled job
         try:
-            from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import scheduler
             scheduler.remove_job(f"oa_{process_id}")
         except:
             pass
@@ -461,27 +464,11 @@ async def trigger_oa_workflow(process_id: str) -> dict:
 async def trigger_final_workflow(process_id: str) -> dict:
     """Trigger final shortlisting workflow manually."""
     try:
-        import pytz
-        
         # Check if deadline has passed
-        processes = await db_manager.get_collection("Processes")
-        proc = await processes.find_one({"_id": ObjectId(process_id)})
-        if not proc:
-            raise HTTPException(status_code=404, detail="Process not found")
-        
-        ist_tz = pytz.timezone('Asia/Kolkata')
-        now = datetime.now(ist_tz)
-        interview_date = proc.get("offline_interview_date")
-        
-        if interview_date:
-            if interview_date.tzinfo is None:
-                interview_date = ist_tz.localize(interview_date)
-            if now > interview_date:
-                raise HTTPException(status_code=400, detail="Interview deadline has passed")
+        await load_process_check_deadline(process_id, "offline_interview_date", "Interview")
         
         # Cancel scheduled job
         try:
-            from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import scheduler
             scheduler.remove_job(f"interview_{process_id}")
         except:
             pass
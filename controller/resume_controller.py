@@ -5,14 +5,17 @@ Handles all business logic related to resume submission and upload.
 
 from fastapi import HTTPException, UploadFile
 from bson import ObjectId
+from pymongo import ReturnDocument
 from db_manager import db_manager
 from db_schema import Candidate
+from controller.process_controller import load_process_check_deadline
 from middleware.auth_middleware import User
-import io
-from typing import Optional
-import pdfplumber
+from middleware.response_cache import invalidate_process_responses
+import asyncio
+from typing import BinaryIO, Optional
+import pypdfium2 as pdfium
 from PyPDF2 import PdfReader
-from datetime import datetime
+from datetime import datetime, timezone
 
 try:
     from docx import Document as DocxDocument
@@ -20,124 +23,151 @@ except Exception:
     DocxDocument = None
 
 
-async def get_candidate_collection():
+def get_candidate_collection():
     """Get the candidate collection."""
-    return await db_manager.get_collection("candidate")
+    return db_manager.get_collection("candidate")
 
 
-async def extract_text_from_upload(file: UploadFile) -> str:
-    """Extract text from uploaded file (PDF, TXT, DOCX)."""
-    content_type = (file.content_type or '').lower()
-    data = await file.read()
-    # Reset for potential re-use
+def _parse_pdf_file(fp: BinaryIO) -> str:
+    """Extract text from a PDF file object with PDFium, falling back to PyPDF2. Blocking."""
+    # Prefer PDFium (text-based PDFs)
     try:
-        file.file.seek(0)
+        fp.seek(0)
+        pdf = pdfium.PdfDocument(fp)
+        try:
+            # Pages are read one after another on purpose: PDFium is not thread-safe, so
+            # sharing this document across a thread pool can crash the process
+            texts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range() or '')
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        text = "\n".join(texts).strip()
+        if text:
+            return text
     except Exception:
         pass
+    # Fallback to PyPDF2
+    try:
+        fp.seek(0)
+        reader = PdfReader(fp)
+        texts = [page.extract_text() or '' for page in reader.pages]
+        text = "\n".join(texts).strip()
+        if text:
+            return text
+    except Exception:
+        pass
+    return ''
 
-    if 'pdf' in content_type:
-        # Prefer pdfplumber (text-based PDFs)
-        try:
-            with pdfplumber.open(io.BytesIO(data)) as pdf:
-                texts = []
-                for page in pdf.pages:
-                    texts.append(page.extract_text() or '')
-                text = "\n".join(texts).strip()
-                if text:
-                    return text
-        except Exception:
-            pass
-        # Fallback to PyPDF2
-        try:
-            reader = PdfReader(io.BytesIO(data))
-            texts = [page.extract_text() or '' for page in reader.pages]
-            text = "\n".join(texts).strip()
+
+def _parse_docx_file(fp: BinaryIO) -> str:
+    """Extract paragraph text from a DOCX file object. Blocking."""
+    fp.seek(0)
+    doc = DocxDocument(fp)
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+def _read_text_file(fp: BinaryIO) -> str:
+    """Decode a plain-text upload as UTF-8. Blocking."""
+    fp.seek(0)
+    return fp.read().decode('utf-8', errors='ignore')
+
+
+async def extract_text_from_upload(file: UploadFile) -> str:
+    """Extract text from uploaded file (PDF, TXT, DOCX)."""
+    content_type = (file.content_type or '').lower()
+    # Starlette already spools the upload (on disk past its size threshold), so the
+    # parsers read that file object directly instead of a full in-memory copy
+    fp = file.file
+
+    try:
+        if 'pdf' in content_type:
+            # PDFium is native code, so run it off the event loop
+            text = await asyncio.to_thread(_parse_pdf_file, fp)
             if text:
                 return text
-        except Exception:
-            pass
-        raise HTTPException(status_code=400, detail="Unable to extract text from PDF. Ensure it is text-based, not scanned.")
+            raise HTTPException(status_code=400, detail="Unable to extract text from PDF. Ensure it is text-based, not scanned.")
 
-    if 'text/plain' in content_type:
-        try:
-            return data.decode('utf-8', errors='ignore')
-        except Exception:
-            raise HTTPException(status_code=400, detail="Unable to decode text file")
+        if 'text/plain' in content_type:
+            try:
+                return await asyncio.to_thread(_read_text_file, fp)
+            except Exception:
+                raise HTTPException(status_code=400, detail="Unable to decode text file")
 
-    if 'officedocument.wordprocessingml.document' in content_type:
-        if not DocxDocument:
-            raise HTTPException(status_code=400, detail="DOCX parsing not available on this server")
+        if 'officedocument.wordprocessingml.document' in content_type:
+            if not DocxDocument:
+                raise HTTPException(status_code=400, detail="DOCX parsing not available on this server")
+            try:
+                return await asyncio.to_thread(_parse_docx_file, fp)
+            except Exception:
+                raise HTTPException(status_code=400, detail="Unable to extract text from DOCX")
+
+        raise HTTPException(status_code=400, detail="Unsupported file type. Upload a text-based PDF, TXT, or DOCX.")
+    finally:
+        # Reset for potential re-use
         try:
-            doc = DocxDocument(io.BytesIO(data))
-            return "\n".join(p.text for p in doc.paragraphs)
+            fp.seek(0)
         except Exception:
-            raise HTTPException(status_code=400, detail="Unable to extract text from DOCX")
-
-    raise HTTPException(status_code=400, detail="Unsupported file type. Upload a text-based PDF, TXT, or DOCX.")
+            pass
 
 
 async def submit_resume(candidate_id: str, candidate_data: Candidate, user: User, process_id: str = None):
     """Submit resume for a candidate."""
     
-    candidates_collection = await get_candidate_collection()
-    applications_collection = await db_manager.get_collection("applications")
+    candidates_collection = get_candidate_collection()
+    applications_collection = db_manager.get_collection("applications")
 
     if not candidate_data.email:
         raise HTTPException(status_code=400, detail="Email is required to submit resume")
 
     # Check deadline if process_id is provided
     if process_id:
-        from bson import ObjectId
-        from bson.errors import InvalidId
-        processes_collection = await db_manager.get_collection("Processes")
-        
-        try:
-            # Validate ObjectId format
-            if not ObjectId.is_valid(process_id):
-                raise HTTPException(status_code=400, detail=f"Invalid process ID format: {process_id}")
-                
-            process = await processes_collection.find_one({"_id": ObjectId(process_id)})
-            if not process:
-                raise HTTPException(status_code=404, detail="Process not found")
-            
-            deadline = process.get("resume_deadline")
-            if deadline and datetime.now() > deadline:
-                raise HTTPException(status_code=400, detail="Application deadline has passed")
-        except InvalidId:
-            raise HTTPException(status_code=400, detail=f"Invalid process ID format: {process_id}")
-        except Exception as e:
-            if isinstance(e, HTTPException):
-                raise
-            raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+        await load_process_check_deadline(process_id, "resume_deadline", "Application")
 
     # Update candidate record (no resume_text here anymore)
     update_doc = {"$set": {}}
     if candidate_data.name is not None:
         update_doc["$set"]["name"] = candidate_data.name
     
-    if update_doc["$set"]:
-        await candidates_collection.update_one(
+    if not process_id:
+        if update_doc["$set"]:
+            await candidates_collection.update_one(
+                {"email": candidate_data.email},
+                update_doc,
+                upsert=True,
+            )
+    else:
+        # Update the name and take the temp resume text in one round-trip
+        update_doc["$unset"] = {"temp_resume_text": ""}
+        if not update_doc["$set"]:
+            del update_doc["$set"]
+        candidate_record = await candidates_collection.find_one_and_update(
             {"email": candidate_data.email},
             update_doc,
-            upsert=True,
+            upsert="$set" in update_doc,
+            projection={"_id": 1, "temp_resume_text": 1},
+            return_document=ReturnDocument.BEFORE
         )
-
-    # Create or update application record if process_id is provided
-    if process_id:
-        
-        # Get the candidate ID
-        candidate_record = await candidates_collection.find_one({"email": candidate_data.email})
+        if not candidate_record and "$set" in update_doc:
+            # Freshly upserted candidate: no pre-image, so look up the new _id
+            candidate_record = await candidates_collection.find_one(
+                {"email": candidate_data.email},
+                projection={"_id": 1}
+            )
         if not candidate_record:
             raise HTTPException(status_code=404, detail="Candidate not found")
         actual_candidate_id = str(candidate_record["_id"])
         
-        # Get temp resume text from candidate record
+        # Temp resume text from the candidate's pre-update record
         temp_resume_text = candidate_record.get("temp_resume_text")
         
         # Update or create application with resume text
         update_data = {
             "status": "Applied",
-            "updated_at": datetime.now()
+            "updated_at": datetime.now(timezone.utc)
         }
         if temp_resume_text:
             update_data["resume_text"] = temp_resume_text
@@ -152,18 +182,12 @@ async def submit_resume(candidate_id: str, candidate_data: Candidate, user: User
                 "$setOnInsert": {
                     "candidate_id": actual_candidate_id,
                     "process_id": process_id,
-                    "created_at": datetime.now()
+                    "created_at": datetime.now(timezone.utc)
                 }
             },
             upsert=True
         )
-        
-        # Clear temp resume text from candidate
-        if temp_resume_text:
-            await candidates_collection.update_one(
-                {"_id": candidate_record["_id"]},
-                {"$unset": {"temp_resume_text": ""}}
-            )
+        await invalidate_process_responses(process_id)
 
     return {"message": "Resume stored. The AI agent will now begin processing."}
 
@@ -173,69 +197,53 @@ async def upload_resume_file(candidate_id: str, name: str = None, file: UploadFi
     
     print(f"DEBUG: upload_resume_file called with process_id: {process_id}")
     
-    candidates_collection = await get_candidate_collection()
-    applications_collection = await db_manager.get_collection("applications")
+    candidates_collection = get_candidate_collection()
+    applications_collection = db_manager.get_collection("applications")
     
-    # Try to find existing candidate by ID or email
-    cand = None
-    try:
-        cand = await candidates_collection.find_one({"_id": ObjectId(candidate_id)})
-    except Exception:
-        pass
-    
-    # If not found by ID, try by email
-    if not cand and user and user.email:
-        cand = await candidates_collection.find_one({"email": user.email})
-        if cand:
-            candidate_id = str(cand["_id"])  # Update candidate_id to match DB
-    
-    # If still not found, create a new candidate
-    if not cand:
-        candidate_doc = {
-            "email": user.email if user else "unknown@example.com",
-            "role": "candidate"
-        }
-        if name:
-            candidate_doc["name"] = name
-            
-        result = await candidates_collection.insert_one(candidate_doc)
-        candidate_id = str(result.inserted_id)
-        cand = candidate_doc
-        cand["_id"] = result.inserted_id
+    if user and user.email:
+        # Return or create the candidate (and apply the name) in one atomic round-trip
+        update_doc = {"$setOnInsert": {"role": "candidate"}}
+        if name is not None:
+            update_doc["$set"] = {"name": name}
+        cand = await candidates_collection.find_one_and_update(
+            {"email": user.email},
+            update_doc,
+            upsert=True,
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        candidate_id = str(cand["_id"])  # Update candidate_id to match DB
+    else:
+        # No email to key on: fall back to the path candidate ID
+        cand = None
+        try:
+            cand = await candidates_collection.find_one({"_id": ObjectId(candidate_id)}, projection={"_id": 1})
+        except Exception:
+            pass
+        
+        if not cand:
+            candidate_doc = {
+                "email": "unknown@example.com",
+                "role": "candidate"
+            }
+            if name:
+                candidate_doc["name"] = name
+                
+            result = await candidates_collection.insert_one(candidate_doc)
+            candidate_id = str(result.inserted_id)
+            cand = candidate_doc
+            cand["_id"] = result.inserted_id
+        elif name is not None:
+            await candidates_collection.update_one(
+                {"_id": cand["_id"]}, 
+                {"$set": {"name": name}}
+            )
 
     resume_text = await extract_text_from_upload(file)
 
-    # Update candidate name if provided
-    if name is not None:
-        await candidates_collection.update_one(
-            {"_id": cand["_id"]}, 
-            {"$set": {"name": name}}
-        )
-
     # If process_id provided, check deadline and store resume directly in application
     if process_id:
-        from bson import ObjectId
-        from bson.errors import InvalidId
-        processes_collection = await db_manager.get_collection("Processes")
-        
-        try:
-            # Validate ObjectId format
-            if not ObjectId.is_valid(process_id):
-                raise HTTPException(status_code=400, detail=f"Invalid process ID format: {process_id}")
-                
-            process = await processes_collection.find_one({"_id": ObjectId(process_id)})
-            if not process:
-                raise HTTPException(status_code=404, detail="Process not found")
-            
-            deadline = process.get("resume_deadline")
-            if deadline and datetime.now() > deadline:
-                raise HTTPException(status_code=400, detail="Application deadline has passed")
-        except InvalidId:
-            raise HTTPException(status_code=400, detail=f"Invalid process ID format: {process_id}")
-        except Exception as e:
-            if isinstance(e, HTTPException):
-                raise
-            raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+        await load_process_check_deadline(process_id, "resume_deadline", "Application")
         
         await applications_collection.update_one(
             {
@@ -246,16 +254,17 @@ async def upload_resume_file(candidate_id: str, name: str = None, file: UploadFi
                 "$set": {
                     "resume_text": resume_text,
                     "status": "Applied",
-                    "updated_at": datetime.now()
+                    "updated_at": datetime.now(timezone.utc)
                 },
                 "$setOnInsert": {
                     "candidate_id": candidate_id,
                     "process_id": process_id,
-                    "created_at": datetime.now()
+                    "created_at": datetime.now(timezone.utc)
                 }
             },
             upsert=True
         )
+        await invalidate_process_responses(process_id)
     else:
         # Store temporarily if no process_id
         await candidates_collection.update_one(
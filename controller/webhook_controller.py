@@ -4,7 +4,10 @@ Handles scheduling and unscheduling of deadline-based workflow jobs.
 """
 
 from fastapi import HTTPException
+from db_manager import db_manager
+from middleware.validation import to_object_id
 from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import (
+    scheduler,
     schedule_process,
     unschedule_process
 )
@@ -12,18 +15,19 @@ from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import (
 
 async def schedule_deadline_webhook(process_id: str):
     """Webhook to schedule a process for deadline execution."""
+    # Reject malformed ids before any I/O
+    oid = to_object_id(process_id, "Invalid process id")
     try:
-        from db_manager import db_manager
-        from bson import ObjectId
-        
-        processes = await db_manager.get_collection("Processes")
-        process_doc = await processes.find_one({"_id": ObjectId(process_id)})
+        processes = db_manager.get_collection("Processes")
+        process_doc = await processes.find_one({"_id": oid})
         
         if not process_doc:
             raise HTTPException(status_code=404, detail="Process not found")
         
         await schedule_process(process_doc)
         return {"message": f"Process {process_id} scheduled successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scheduling failed: {str(e)}")
 
@@ -40,7 +44,6 @@ async def unschedule_deadline_webhook(process_id: str):
 async def get_scheduled_jobs_webhook():
     """Webhook to get all scheduled deadline jobs."""
     try:
-        from workflow.resume_scoring.ap_scheduler_trigger_on_deadline import scheduler
         jobs = []
         for job in scheduler.get_jobs():
             jobs.append({
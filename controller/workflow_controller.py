@@ -6,10 +6,24 @@ Handles all business logic related to workflow management and scheduling.
 import asyncio
 from fastapi import HTTPException
 from typing import List, Dict, Any
+from db_manager import db_manager
+from middleware.validation import to_object_id
+from middleware.aggregation import with_candidate_pipeline
 from workflow.resume_scoring.resume_shortlisting_workflow import run_resume_scoring_workflow
 from workflow.assessment_workflow import process_assessment_results, bulk_update_assessment_scores
 from workflow.interview_workflow import process_interview_results, bulk_update_interview_scores
 
+# Statuses counted in get_workflow_status, in response order
+WORKFLOW_STATUS_KEYS = (
+    "Applied",
+    "Resume_shortlisted",
+    "Resume_rejected",
+    "OA_cleared",
+    "OA_rejected",
+    "Interview_cleared",
+    "Interview_rejected"
+)
+
 
 async def trigger_resume_workflow(process_id: str):
     """
@@ -18,12 +32,10 @@ async def trigger_resume_workflow(process_id: str):
     """
     try:
         # Add timeout to prevent hanging on Render
-        result = await asyncio.wait_for(
-            run_resume_scoring_workflow(process_id), 
-            timeout=30.0
-        )
+        async with asyncio.timeout(30.0):
+            result = await run_resume_scoring_workflow(process_id)
         return result
-    except asyncio.TimeoutError:
+    except TimeoutError:
         raise HTTPException(status_code=408, detail="Workflow timeout - process may still be running")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to trigger resume workflow: {str(e)}")
@@ -112,43 +124,40 @@ async def reset_scheduler():
 
 async def get_workflow_status(process_id: str):
     """Get the current status of all candidates in a process."""
+    # Reject malformed ids before running either aggregation
+    to_object_id(process_id, "Invalid process id")
     try:
-        from db_manager import db_manager
-        from bson import ObjectId
-        
-        applications = await db_manager.get_collection("applications")
-        candidates = await db_manager.get_collection("candidate")
+        applications = db_manager.get_collection("applications")
         
-        status_summary = {
-            "Applied": 0,
-            "Resume_shortlisted": 0,
-            "Resume_rejected": 0,
-            "OA_cleared": 0,
-            "OA_rejected": 0,
-            "Interview_cleared": 0,
-            "Interview_rejected": 0
-        }
-        
-        candidate_details = []
+        # Detail rows: join candidate names server-side
+        rows_pipeline = with_candidate_pipeline(
+            {"process_id": process_id},
+            ("status", "resume_match_score", "oa_score", "tech_score", "hr_score"),
+            candidate_fields=("name",)
+        ) + [
+            {"$project": {
+                "_id": 0,
+                "candidate_id": 1,
+                "candidate_name": {"$ifNull": ["$candidate.name", "Unknown"]},
+                "status": {"$ifNull": ["$status", "Applied"]},
+                "resume_score": "$resume_match_score",
+                "oa_score": 1,
+                "tech_score": 1,
+                "hr_score": 1
+            }}
+        ]
+        # Status counts: grouped server-side, answered from the (process_id, status) index
+        summary_pipeline = [
+            {"$match": {"process_id": process_id}},
+            {"$group": {"_id": {"$ifNull": ["$status", "Applied"]}, "n": {"$sum": 1}}}
+        ]
         
-        async for app in applications.find({"process_id": process_id}):
-            status = app.get("status", "Applied")
-            if status in status_summary:
-                status_summary[status] += 1
-            
-            # Get candidate name
-            candidate = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
-            candidate_name = candidate.get("name", "Unknown") if candidate else "Unknown"
-            
-            candidate_details.append({
-                "candidate_id": app["candidate_id"],
-                "candidate_name": candidate_name,
-                "status": status,
-                "resume_score": app.get("resume_match_score"),
-                "oa_score": app.get("oa_score"),
-                "tech_score": app.get("tech_score"),
-                "hr_score": app.get("hr_score")
-            })
+        candidate_details, summary = await asyncio.gather(
+            applications.aggregate(rows_pipeline).to_list(None),
+            applications.aggregate(summary_pipeline).to_list(None)
+        )
+        counts = {row["_id"]: row["n"] for row in summary}
+        status_summary = {status: counts.get(status, 0) for status in WORKFLOW_STATUS_KEYS}
         
         return {
             "process_id": process_id,
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -12,11 +13,29 @@ DB_NAME = os.getenv("MONGODB_DATABASE")
 if not MONGO_URI or not DB_NAME:
     raise ValueError("MONGODB_URI and MONGODB_DATABASE must be set in environment/.env")
 
+# Connection pool bounds: sized for concurrent requests plus gathered workflow fan-out
+MIN_POOL_SIZE = 10
+MAX_POOL_SIZE = 100
+
+# (collection, keys, create_index options) for every index the app relies on
+INDEXES = [
+    ("applications", [("candidate_id", 1), ("process_id", 1)], {"unique": True}),
+    # Per-process listings, filtered by status or by resume score
+    ("applications", [("process_id", 1), ("status", 1)], {}),
+    ("applications", [("process_id", 1), ("resume_match_score", 1)], {}),
+    ("candidate", "email", {"unique": True}),
+    ("Processes", "assessment_date", {}),
+    # HR dashboard listing: filter by hr_id, newest first
+    ("Processes", [("hr_id", 1), ("_id", -1)], {}),
+]
+
 
 class Database:
     def __init__(self):
         self.client = None
         self.db = None
+        # Collection handles by name, built once per client
+        self._collections = {}
     
     def _ensure_client(self):
         if self.client is None:
@@ -25,9 +44,11 @@ class Database:
                 serverSelectionTimeoutMS=30000,
                 connectTimeoutMS=20000,
                 socketTimeoutMS=60000,
-                maxPoolSize=5,
-                minPoolSize=1,
+                maxPoolSize=MAX_POOL_SIZE,
+                minPoolSize=MIN_POOL_SIZE,
+                waitQueueTimeoutMS=2000,  # fail fast instead of hanging when the pool is exhausted
                 retryWrites=True,
+                retryReads=True,
                 readPreference='primaryPreferred',
                 w='majority',
                 wtimeoutMS=30000,
@@ -36,9 +57,12 @@ class Database:
             )
             self.db = self.client[DB_NAME]
 
-    async def get_collection(self, collection_name: str):
-        self._ensure_client()
-        return self.db[collection_name]
+    def get_collection(self, collection_name: str):
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            self._ensure_client()
+            collection = self._collections[collection_name] = self.db[collection_name]
+        return collection
     
     async def health_check(self):
         """Check if database connection is healthy"""
@@ -50,13 +74,28 @@ class Database:
             print(f"Database health check failed: {e}")
             return False
 
+    async def warm_pool(self, connections: int = MIN_POOL_SIZE):
+        """Open pool connections up front with concurrent pings."""
+        self._ensure_client()
+        await asyncio.gather(*(self.client.admin.command('ping') for _ in range(connections)))
+
+    async def ensure_indexes(self):
+        """Create indexes backing the hot lookup paths (idempotent)."""
+        self._ensure_client()
+        for collection_name, keys, options in INDEXES:
+            try:
+                await self.db[collection_name].create_index(keys, **options)
+            except Exception as e:
+                # A failing index (e.g. duplicates blocking a unique one) must not block the rest
+                print(f"Failed to create index {keys} on {collection_name}: {e}")
+
 
 db_manager = Database()
 
 
 async def print_all_candidates():
     try:
-        collection = await db_manager.get_collection("candidate")
+        collection = db_manager.get_collection("candidate")
         candidates = await collection.find({}).to_list(length=None)
         print(f"Found {len(candidates)} candidates:")
         for candidate in candidates:
@@ -66,7 +105,6 @@ async def print_all_candidates():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(print_all_candidates())
 
 
@@ -9,7 +9,7 @@ class Candidate(BaseModel):
     """
     name: Optional[str] = None
     email: EmailStr
-    password: Optional[str] = None  # stored as-is for now; hash in production
+    password: Optional[str] = None  # bcrypt hash, see auth_controller.hash_password
     role: Optional[str] = None
 
 class Application(BaseModel):
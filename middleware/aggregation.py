@@ -0,0 +1,41 @@
+"""
+Shared aggregation stages.
+Applications store candidate_id/process_id as strings, so every join converts the id
+to an ObjectId first; building those stages here keeps the joins identical everywhere.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def join_by_id(local_field: str, from_collection: str, as_field: str,
+               fields: Optional[Iterable[str]] = None, keep_unmatched: bool = True) -> List[dict]:
+    """
+    Stages that embed the from_collection document whose _id matches the string id in
+    local_field under as_field, keeping only `fields` (the whole document when None).
+    Malformed ids match nothing. Unmatched rows get an empty as_field when fields are
+    given (none otherwise), or are dropped when keep_unmatched is False.
+    """
+    stages = [
+        {"$addFields": {"_join_oid": {"$convert": {"input": f"${local_field}", "to": "objectId", "onError": None, "onNull": None}}}},
+        {"$lookup": {"from": from_collection, "localField": "_join_oid", "foreignField": "_id", "as": as_field}},
+        {"$unwind": {"path": f"${as_field}", "preserveNullAndEmptyArrays": keep_unmatched}},
+    ]
+    if fields is not None:
+        stages.append({"$addFields": {as_field: {field: f"${as_field}.{field}" for field in fields}}})
+    stages.append({"$project": {"_join_oid": 0}})
+    return stages
+
+
+def with_candidate_pipeline(match: Dict[str, Any], fields: Iterable[str],
+                            candidate_fields: Iterable[str] = ("name", "email"),
+                            keep_unmatched: bool = True) -> List[dict]:
+    """
+    Aggregation over applications that keeps candidate_id plus `fields` and joins
+    each row with its candidate's candidate_fields under "candidate".
+    """
+    return [
+        {"$match": match},
+        # Drop resume_text and other unused fields before the join
+        {"$project": {"candidate_id": 1, **{field: 1 for field in fields}}},
+        *join_by_id("candidate_id", "candidate", "candidate", candidate_fields, keep_unmatched)
+    ]
@@ -1,8 +1,24 @@
 from fastapi import HTTPException, Depends, Cookie
-from typing import Optional
-import json
+from typing import Any, Dict, Optional
 import jwt
 import os
+import time
+from dotenv import load_dotenv
+
+# Load environment variables before reading the JWT settings, whatever the import order
+load_dotenv(override=False)
+
+# Read once at import; shared by token signing in auth_router
+JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-me")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False, "verify_iat": False, "require": ["exp"]}
+
+# Configuration: Seconds decoded token claims are reused, and the most tokens kept
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAXSIZE = 10000
+
+# raw token -> (expires at as unix time, decoded claims)
+_token_cache: Dict[str, Any] = {}
 
 class User:
     def __init__(self, email: str, role: str, user_id: str):
@@ -10,34 +26,56 @@ class User:
         self.role = role
         self.user_id = user_id
 
-async def get_current_user(user_data: Optional[str] = Cookie(None), token: Optional[str] = Cookie(None)) -> User:
-    """Read user data from cookie and validate token"""
-    if not user_data or not token:
+def decode_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims, reusing them for up to TOKEN_CACHE_TTL seconds.
+    Raises the jwt exceptions on an invalid or expired token.
+    """
+    # Wall-clock time, since it is compared with the token's exp claim
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    # Only signature and exp matter for our tokens; skip the aud/iss/iat claim checks
+    data = jwt.decode(
+        token,
+        JWT_SECRET,
+        algorithms=[JWT_ALGORITHM],
+        options=JWT_DECODE_OPTIONS
+    )  # This will raise exception if expired
+    # Never serve cached claims past the token's own expiry
+    expires_at = min(now + TOKEN_CACHE_TTL, data.get("exp", now + TOKEN_CACHE_TTL))
+    if len(_token_cache) >= TOKEN_CACHE_MAXSIZE:
+        _token_cache.clear()
+    _token_cache[token] = (expires_at, data)
+    return data
+
+
+def invalidate_token(token: Optional[str]):
+    """Drop a token's cached claims; call on logout."""
+    if token:
+        _token_cache.pop(token, None)
+
+
+async def get_current_user(token: Optional[str] = Cookie(None)) -> User:
+    """Build the user from the validated token's claims"""
+    if not token:
         raise HTTPException(status_code=401, detail="Please login")
     
     # Check if token is expired
     try:
-        secret = os.getenv("JWT_SECRET", "dev-secret-change-me")
-        jwt.decode(token, secret, algorithms=["HS256"])  # This will raise exception if expired
+        data = decode_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Session expired, please login again")
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    # Parse user data
+    # The token carries the same fields as the user_data cookie, which is left for the frontend
     try:
-        # Handle base64 encoded user data
-        import base64
-        decoded_data = base64.b64decode(user_data).decode('utf-8')
-        data = json.loads(decoded_data)
-        return User(data["email"], data["role"], data["candidate_id"])
-    except:
-        # Fallback: try parsing without base64 decode
-        try:
-            data = json.loads(user_data)
-            return User(data["email"], data["role"], data["candidate_id"])
-        except:
-            raise HTTPException(status_code=401, detail="Invalid user data")
+        return User(data["sub"], data["role"], data["candidate_id"])
+    except KeyError:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
 async def require_candidate(user: User = Depends(get_current_user)) -> User:
     """Only candidates allowed"""
@@ -0,0 +1,43 @@
+"""
+Database retry utilities.
+Retries controller coroutines on transient MongoDB connection errors.
+"""
+
+import asyncio
+import random
+from functools import wraps
+from typing import Callable
+
+import pymongo.errors
+from fastapi import HTTPException
+
+
+# WaitQueueTimeoutError: no pooled connection freed up within waitQueueTimeoutMS
+TRANSIENT_DB_ERRORS = (
+    pymongo.errors.NetworkTimeout,
+    pymongo.errors.ServerSelectionTimeoutError,
+    pymongo.errors.WaitQueueTimeoutError
+)
+
+
+def with_db_retry(attempts: int = 3, base: float = 0.1) -> Callable:
+    """
+    Retry a coroutine on transient DB errors with exponential backoff and jitter.
+    Raises HTTP 503 once all attempts are exhausted.
+    Usage:
+        @with_db_retry()
+        async def handler(...):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except TRANSIENT_DB_ERRORS:
+                    if attempt == attempts - 1:
+                        raise HTTPException(status_code=503, detail="Database connection failed. Please try again later.")
+                    await asyncio.sleep(base * 2 ** attempt + random.random() * base)
+        return wrapper
+    return decorator
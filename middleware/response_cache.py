@@ -0,0 +1,66 @@
+"""
+In-process response cache for read-heavy HR routes.
+Entries are grouped by hr_id so any write to an HR's processes drops that HR's cached reads.
+"""
+
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+from workflow.process_cache import get_process
+
+
+# Configuration: Most responses kept before the cache is reset
+RESPONSE_CACHE_MAXSIZE = 1024
+
+# (hr_id, route name, other path/query params) -> (expires at, response)
+_responses: Dict[Tuple, Any] = {}
+
+
+def cached_response(ttl: int = 15) -> Callable:
+    """
+    Cache a route's return value for ttl seconds, keyed by its hr_id and other
+    plain parameters (dependencies such as the user are left out of the key).
+    Usage:
+        @router.get("/{hr_id}/processes")
+        @cached_response(ttl=15)
+        async def handler(hr_id: str, user: User = Depends(require_hr)):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            params = tuple(sorted(
+                (name, value) for name, value in kwargs.items()
+                if name != "hr_id" and isinstance(value, (str, int))
+            ))
+            key = (kwargs.get("hr_id"), func.__name__, params)
+            now = time.monotonic()
+            cached = _responses.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
+            response = await func(*args, **kwargs)
+            if len(_responses) >= RESPONSE_CACHE_MAXSIZE:
+                _responses.clear()
+            _responses[key] = (now + ttl, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_hr_responses(hr_id: str):
+    """Drop every cached response for an HR; call after any write on their processes."""
+    for key in [key for key in _responses if key[0] == hr_id]:
+        _responses.pop(key, None)
+
+
+async def invalidate_process_responses(process_id: str):
+    """
+    Drop cached responses for the HR who owns a process. Call after writes made
+    outside the HR routes (scheduler jobs, candidate submissions).
+    """
+    if not _responses:
+        return
+    process_data = await get_process(process_id)
+    if process_data and process_data.get("hr_id"):
+        invalidate_hr_responses(str(process_data["hr_id"]))
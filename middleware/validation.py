@@ -0,0 +1,14 @@
+"""
+Request validation helpers.
+Cheap checks that reject malformed input before any database I/O.
+"""
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def to_object_id(value: str, detail: str = "Invalid id") -> ObjectId:
+    """Convert a string id to ObjectId, raising HTTP 400 if it is malformed."""
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=detail)
+    return ObjectId(value)
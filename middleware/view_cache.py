@@ -0,0 +1,34 @@
+"""
+Conditional responses for the static HTML views.
+Lets browsers revalidate a page with If-None-Match and get an empty 304 back
+instead of downloading identical HTML again.
+"""
+
+import os
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+
+# Views aren't content-hashed, so browsers revalidate them after a minute
+VIEW_CACHE_CONTROL = "public, max-age=60"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def etag_file_response(path: str, request: Request) -> Response:
+    """Serve a file with a weak mtime/size ETag, answering 304 when the client's copy matches."""
+    st = os.stat(path)
+    etag = f'W/"{int(st.st_mtime):x}-{st.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": VIEW_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    # Pass the stat result so FileResponse doesn't stat the file a second time
+    return FileResponse(path, headers=headers, stat_result=st)
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Response, Cookie
 from fastapi.responses import FileResponse
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 import jwt
 import os
-import json
+import orjson
 import base64
  
 from controller.auth_controller import handle_signup, handle_login, UserCreate, UserLogin
+from middleware.auth_middleware import JWT_SECRET, JWT_ALGORITHM, invalidate_token
 
 def _view_path(filename: str) -> str:
     return os.path.join(os.path.dirname(__file__), "..", "views", filename)
 
+# Token lifetime in minutes, read once at import
+JWT_EXPIRES_MIN = int(os.getenv("JWT_EXPIRES_MIN", "60"))
+
 router = APIRouter()
 
 # Auth API endpoints
@@ -22,29 +27,26 @@ async def api_signup(user_data: UserCreate):
 async def api_login(user_data: UserLogin, response: Response):
     user = await handle_login(user_data)
 
-    jwt_secret = os.getenv("JWT_SECRET", "dev-secret-change-me")
-    jwt_algo = os.getenv("JWT_ALGORITHM", "HS256")
-    jwt_exp_minutes = int(os.getenv("JWT_EXPIRES_MIN", "60"))
-
     candidate_id = getattr(user, "candidate_id", None)
 
+    now = datetime.now(timezone.utc)
     payload = {
         "sub": user.email,
         "role": user.role,
         "candidate_id": candidate_id,
-        "exp": datetime.now(timezone.utc) + timedelta(minutes=jwt_exp_minutes),
-        "iat": datetime.now(timezone.utc),
+        "exp": now + timedelta(minutes=JWT_EXPIRES_MIN),
+        "iat": now,
     }
-    token = jwt.encode(payload, jwt_secret, algorithm=jwt_algo)
+    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     
     user_data = {"email": user.email, "role": user.role, "candidate_id": candidate_id}
-    encoded_user_data = base64.b64encode(json.dumps(user_data).encode()).decode()
+    encoded_user_data = base64.b64encode(orjson.dumps(user_data)).decode()
 
     # Set cookies with automatic expiration
     response.set_cookie(
         key="token",
         value=token,
-        max_age=jwt_exp_minutes * 60,
+        max_age=JWT_EXPIRES_MIN * 60,
         httponly=False,
         secure=False,
         samesite="lax",
@@ -54,7 +56,7 @@ async def api_login(user_data: UserLogin, response: Response):
     response.set_cookie(
         key="user_data",
         value=encoded_user_data,
-        max_age=jwt_exp_minutes * 60,
+        max_age=JWT_EXPIRES_MIN * 60,
         httponly=False,
         secure=False,
         samesite="lax",
@@ -68,7 +70,8 @@ async def api_login(user_data: UserLogin, response: Response):
     }
 
 @router.post("/logout")  # Called by: Logout button | Returns: Cookie deletion confirmation
-async def api_logout(response: Response):
+async def api_logout(response: Response, token: Optional[str] = Cookie(None)):
+    invalidate_token(token)
     response.delete_cookie(key="token", path="/")
     response.delete_cookie(key="user_data", path="/")
     return {"message": "Logged out successfully"}
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, Cookie
+from fastapi import APIRouter, Depends, Cookie, Query
 from fastapi.responses import FileResponse, RedirectResponse
 import os
 from typing import Optional
 
-from controller.process_controller import list_hiring_processes
+from controller.process_controller import LIST_PROCESSES_MAX_LIMIT, list_hiring_processes, get_process_detail
 from controller.workflow_controller import get_scheduler_status, reset_scheduler
-from middleware.auth_middleware import User, get_current_user
+from middleware.auth_middleware import User, get_current_user, decode_token
 
 def _view_path(filename: str) -> str:
     return os.path.join(os.path.dirname(__file__), "..", "views", filename)
@@ -23,12 +23,11 @@ async def serve_home_page():
 
 # Global endpoints
 @router.get("/processes")  # Called by: Home page JS | Returns: List of all available processes
-async def get_all_processes():
-    return await list_hiring_processes()
+async def get_all_processes(skip: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=LIST_PROCESSES_MAX_LIMIT)):
+    return await list_hiring_processes(skip=skip, limit=limit)
 
 @router.get("/processes/{process_id}")  # Called by: Process detail JS | Returns: Specific process details
 async def get_process_detail_global(process_id: str):
-    from controller.process_controller import get_process_detail
     return await get_process_detail(process_id)
 
 # Scheduler endpoints
@@ -47,13 +46,12 @@ async def validate_token_endpoint(user: User = Depends(get_current_user)):
 @router.get("/auth-status")  # Called by: Navbar JS | Returns: Current auth status without requiring auth
 async def get_auth_status(token: Optional[str] = Cookie(None)):
     """Check auth status without throwing errors"""
-    if not token:
+    # A JWT is always header.payload.signature; skip decoding anything else
+    if not token or token.count(".") != 2:
         return {"authenticated": False}
     
     try:
-        import jwt
-        secret = os.getenv("JWT_SECRET", "dev-secret-change-me")
-        data = jwt.decode(token, secret, algorithms=["HS256"])
+        data = decode_token(token)
         return {
             "authenticated": True,
             "user_id": data["candidate_id"],
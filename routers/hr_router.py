@@ -1,40 +1,64 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 import os
+from typing import Optional
 
-from controller.process_controller import create_hiring_process, list_hiring_processes, shortlist_process_candidates, get_process_detail, sync_application_status, delete_hiring_process, get_oa_shortlisted_candidates, save_hr_scores, execute_final_shortlisting, trigger_oa_workflow, trigger_final_workflow
+from controller.process_controller import LIST_PROCESSES_MAX_LIMIT, create_hiring_process, list_hiring_processes, shortlist_process_candidates, get_process_detail, sync_application_status, delete_hiring_process, get_oa_shortlisted_candidates, save_hr_scores, execute_final_shortlisting, trigger_oa_workflow, trigger_final_workflow
 from controller.workflow_controller import trigger_workflow
 from controller.webhook_controller import schedule_deadline_webhook, unschedule_deadline_webhook, get_scheduled_jobs_webhook
 from middleware.auth_middleware import User, require_hr
 from db_schema import HiringProcess
-
-def _view_path(filename: str) -> str:
-    return os.path.join(os.path.dirname(__file__), "..", "views", filename)
+from middleware.response_cache import cached_response, invalidate_hr_responses
+from middleware.view_cache import etag_file_response
+
+# View files resolved once at import
+VIEWS_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "..", "views"))
+VIEWS = {name: os.path.join(VIEWS_DIR, name) for name in (
+    "hr_list_processes.html",
+    "hr_process_detail.html",
+    "home.html",
+    "hr_create_process.html",
+    "hr_scoring.html",
+)}
 
 router = APIRouter()
 
+# Seconds the dashboard/detail reads are reused; writes through these routes drop them early
+HR_RESPONSE_CACHE_TTL = 15
+
 # Hiring process routes
 @router.post("/{hr_id}/create_process")  # Called by: HR create form | Returns: New process confirmation
 async def create_process(hr_id: str, process: HiringProcess, user: User = Depends(require_hr)):
     process.hr_id = hr_id
-    return await create_hiring_process(process)
+    try:
+        return await create_hiring_process(process)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 # More specific routes first
 @router.post("/{hr_id}/processes/{process_id}/shortlist")  # Called by: HR shortlist button | Returns: Shortlisted candidates list
 async def shortlist_candidates(hr_id: str, process_id: str, user: User = Depends(require_hr)):
     from datetime import datetime
     print(f"🔥 T0: Button clicked - Route hit at {datetime.now()}")
-    result = await shortlist_process_candidates(process_id)
+    try:
+        result = await shortlist_process_candidates(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
     print(f"🏁 T_FINAL: Workflow complete at {datetime.now()}")
     return result
 
 @router.post("/{hr_id}/processes/{process_id}/trigger-workflow")  # Called by: HR workflow trigger | Returns: Workflow execution status
 async def trigger_workflow_endpoint(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await trigger_workflow(process_id)
+    try:
+        return await trigger_workflow(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.post("/{hr_id}/processes/{process_id}/sync-status")  # Called by: HR sync button | Returns: Updated application statuses
 async def sync_status_endpoint(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await sync_application_status(process_id)
+    try:
+        return await sync_application_status(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.post("/{hr_id}/processes/{process_id}/schedule-deadline")  # Called by: HR schedule button | Returns: Scheduled job confirmation
 async def schedule_deadline_endpoint(hr_id: str, process_id: str, user: User = Depends(require_hr)):
@@ -50,40 +74,59 @@ async def get_scheduled_jobs_endpoint(hr_id: str, user: User = Depends(require_h
 
 @router.delete("/{hr_id}/processes/{process_id}")  # Called by: HR delete button | Returns: Delete confirmation
 async def delete_process(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await delete_hiring_process(process_id)
+    try:
+        return await delete_hiring_process(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.get("/{hr_id}/processes/{process_id}")  # Called by: HR process detail page | Returns: Process details and applications
+@cached_response(ttl=HR_RESPONSE_CACHE_TTL)
 async def get_process(hr_id: str, process_id: str, user: User = Depends(require_hr)):
     return await get_process_detail(process_id)
 
 @router.get("/api/{hr_id}/processes/{process_id}/oa-shortlisted")  # Called by: HR scoring page | Returns: OA shortlisted candidates
+@cached_response(ttl=HR_RESPONSE_CACHE_TTL)
 async def get_oa_shortlisted(hr_id: str, process_id: str, user: User = Depends(require_hr)):
     return await get_oa_shortlisted_candidates(process_id)
 
 @router.post("/{hr_id}/processes/{process_id}/save-hr-scores")  # Called by: HR scoring page | Returns: Save confirmation
 async def save_scores(hr_id: str, process_id: str, scores: dict, user: User = Depends(require_hr)):
-    return await save_hr_scores(process_id, scores["scores"])
+    try:
+        return await save_hr_scores(process_id, scores["scores"])
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.post("/{hr_id}/processes/{process_id}/final-shortlist")  # Called by: HR scoring page | Returns: Final shortlisting results
 async def final_shortlist(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await execute_final_shortlisting(process_id)
+    try:
+        return await execute_final_shortlisting(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.post("/{hr_id}/processes/{process_id}/trigger-oa-workflow")  # Called by: HR process detail page | Returns: OA workflow results
 async def trigger_oa_workflow_endpoint(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await trigger_oa_workflow(process_id)
+    try:
+        return await trigger_oa_workflow(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 @router.post("/{hr_id}/processes/{process_id}/trigger-final-workflow")  # Called by: HR process detail page | Returns: Final workflow results
 async def trigger_final_workflow_endpoint(hr_id: str, process_id: str, user: User = Depends(require_hr)):
-    return await trigger_final_workflow(process_id)
+    try:
+        return await trigger_final_workflow(process_id)
+    finally:
+        invalidate_hr_responses(hr_id)
 
 # Less specific routes after
 @router.get("/api/{hr_id}/processes")  # Called by: HR dashboard | Returns: List of all HR's processes
-async def get_processes(hr_id: str, user: User = Depends(require_hr)):
-    return await list_hiring_processes(hr_id)
+@cached_response(ttl=HR_RESPONSE_CACHE_TTL)
+async def get_processes(hr_id: str, skip: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=LIST_PROCESSES_MAX_LIMIT), user: User = Depends(require_hr)):
+    return await list_hiring_processes(hr_id, skip, limit)
 
 @router.get("/{hr_id}/processes")  # Called by: HR redirect | Returns: List of all HR's processes
-async def get_processes_redirect(hr_id: str, user: User = Depends(require_hr)):
-    return await list_hiring_processes(hr_id)
+@cached_response(ttl=HR_RESPONSE_CACHE_TTL)
+async def get_processes_redirect(hr_id: str, skip: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=LIST_PROCESSES_MAX_LIMIT), user: User = Depends(require_hr)):
+    return await list_hiring_processes(hr_id, skip, limit)
 
 # HR endpoint to view applications to their processes
 @router.get("/{hr_id}/applications")  # Called by: HR applications page | Returns: All applications to HR's processes
@@ -91,22 +134,23 @@ async def get_hr_applications(hr_id: str, user: User = Depends(require_hr)):
     return {"message": "HR applications view - not implemented yet", "hr_id": hr_id}
 
 # HR views - move to end to avoid conflicts
+# Plain def: they only stat/read files, so Starlette runs them on its threadpool
 @router.get("/{hr_id}/show_all_processes")  # Called by: Browser navigation | Returns: HR processes list HTML page
-async def serve_list_processes_view(hr_id: str):
-    return FileResponse(_view_path("hr_list_processes.html"))
+def serve_list_processes_view(hr_id: str, request: Request):
+    return etag_file_response(VIEWS["hr_list_processes.html"], request)
 
 @router.get("/{hr_id}/show_process_detail/{process_id}")  # Called by: Browser navigation | Returns: Process detail HTML page
-async def serve_process_detail_view(hr_id: str, process_id: str):
-    return FileResponse(_view_path("hr_process_detail.html"))
+def serve_process_detail_view(hr_id: str, process_id: str, request: Request):
+    return etag_file_response(VIEWS["hr_process_detail.html"], request)
 
 @router.get("/{hr_id}/home")  # Called by: Browser navigation | Returns: HR home HTML page
-async def serve_hr_home_page(hr_id: str):
-    return FileResponse(_view_path("home.html"))
+def serve_hr_home_page(hr_id: str, request: Request):
+    return etag_file_response(VIEWS["home.html"], request)
 
 @router.get("/{hr_id}/create_process")  # Called by: Browser navigation | Returns: Create process HTML form
-async def serve_create_process_view(hr_id: str):
-    return FileResponse(_view_path("hr_create_process.html"))
+def serve_create_process_view(hr_id: str, request: Request):
+    return etag_file_response(VIEWS["hr_create_process.html"], request)
 
 @router.get("/{hr_id}/processes/{process_id}/scoring")  # Called by: Browser navigation | Returns: HR scoring HTML page
-async def serve_hr_scoring_view(hr_id: str, process_id: str):
-    return FileResponse(_view_path("hr_scoring.html"))
\ No newline at end of file
+def serve_hr_scoring_view(hr_id: str, process_id: str, request: Request):
+    return etag_file_response(VIEWS["hr_scoring.html"], request)
\ No newline at end of file
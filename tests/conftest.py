@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests import the app modules the way app.py does, from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# db_manager reads these at import; tests never open a connection
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DATABASE", "hiring_test")
@@ -0,0 +1,27 @@
+"""Password hashing used by signup and login."""
+
+from controller.auth_controller import _DUMMY_HASH, hash_password, is_password_hash, verify_password
+
+
+def test_hash_and_verify_password():
+    hashed = hash_password("s3cret-pass")
+    assert is_password_hash(hashed)
+    assert verify_password("s3cret-pass", hashed)
+    assert not verify_password("wrong-pass", hashed)
+
+
+def test_long_password_uses_first_72_bytes():
+    password = "x" * 100
+    hashed = hash_password(password)
+    assert verify_password(password, hashed)
+    assert verify_password("x" * 72, hashed)
+
+
+def test_dummy_hash_rejects_logins():
+    assert is_password_hash(_DUMMY_HASH)
+    assert not verify_password("anything", _DUMMY_HASH)
+
+
+def test_legacy_plaintext_is_not_a_hash():
+    assert not is_password_hash("plaintext-password")
+    assert not verify_password("plaintext-password", "plaintext-password")
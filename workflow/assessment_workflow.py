@@ -6,10 +6,16 @@ Handles scoring and email notifications for online assessments.
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 from db_manager import db_manager
-from bson import ObjectId
+from pymongo import UpdateOne
 from workflow.email_notifications.email_service import notify_assessment_results
+from workflow.process_cache import get_process
+from middleware.aggregation import with_candidate_pipeline
+from middleware.response_cache import invalidate_process_responses
 from datetime import timedelta
 
+# Documents fetched per cursor round-trip when draining result sets
+CURSOR_BATCH_SIZE = 500
+
 
 async def process_assessment_results(process_id: str, assessment_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -24,54 +30,53 @@ async def process_assessment_results(process_id: str, assessment_results: List[D
     """
     try:
         # Get process data
-        processes = await db_manager.get_collection("Processes")
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
+        process_data = await get_process(process_id)
         
         if not process_data:
             return {"error": "Process not found"}
         
-        # Get applications and candidates
-        applications = await db_manager.get_collection("applications")
-        candidates = await db_manager.get_collection("candidate")
+        applications = db_manager.get_collection("applications")
         
-        updated_candidates = []
-        update_count = 0
+        # Latest score per candidate (a repeated candidate_id keeps its last result)
+        scores = {result["candidate_id"]: result["score"] for result in assessment_results}
         
-        for result in assessment_results:
-            candidate_id = result["candidate_id"]
-            oa_score = result["score"]
-            
+        # Applications that exist, joined with the candidate's name/email in one query.
+        # Every matched application is modified (updated_at always changes).
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "candidate_id": {"$in": list(scores)}}, (), keep_unmatched=False
+        )
+        matched = await applications.aggregate(pipeline).to_list(None)
+        
+        now = datetime.now(timezone.utc)
+        ops = []
+        for candidate_id, oa_score in scores.items():
             # Determine status based on score (threshold: 60)
             new_status = "OA_cleared" if oa_score >= 60 else "OA_rejected"
-            
-            # Update application in database
-            update_result = await applications.update_one(
-                {
-                    "candidate_id": candidate_id,
-                    "process_id": process_id
-                },
-                {
-                    "$set": {
-                        "oa_score": oa_score,
-                        "status": new_status,
-                        "updated_at": datetime.now(timezone.utc)
-                    }
-                }
-            )
-            
-            if update_result.modified_count > 0:
-                update_count += 1
-                
-                # Get candidate details for email
-                candidate = await candidates.find_one({"_id": ObjectId(candidate_id)})
-                if candidate:
-                    updated_candidates.append({
-                        "_id": candidate_id,
-                        "name": candidate.get("name"),
-                        "email": candidate.get("email"),
-                        "oa_score": oa_score,
-                        "status": new_status
-                    })
+            ops.append(UpdateOne(
+                {"candidate_id": candidate_id, "process_id": process_id},
+                {"$set": {"oa_score": oa_score, "status": new_status, "updated_at": now}}
+            ))
+        
+        # Update all applications in one round-trip
+        update_count = 0
+        if ops:
+            bulk_result = await applications.bulk_write(ops, ordered=False)
+            update_count = bulk_result.modified_count
+        
+        # Candidate details for email
+        updated_candidates = []
+        cleared_count = 0
+        for app in matched:
+            oa_score = scores[app["candidate_id"]]
+            cleared = oa_score >= 60
+            cleared_count += cleared
+            updated_candidates.append({
+                "_id": app["candidate_id"],
+                "name": app["candidate"].get("name"),
+                "email": app["candidate"].get("email"),
+                "oa_score": oa_score,
+                "status": "OA_cleared" if cleared else "OA_rejected"
+            })
         
         # Send email notifications
         process_name = process_data.get("process_name", "Unknown Position")
@@ -81,8 +86,8 @@ async def process_assessment_results(process_id: str, assessment_results: List[D
             "status": "success",
             "total_processed": len(assessment_results),
             "updated_count": update_count,
-            "cleared_count": len([c for c in updated_candidates if c["status"] == "OA_cleared"]),
-            "rejected_count": len([c for c in updated_candidates if c["status"] == "OA_rejected"]),
+            "cleared_count": cleared_count,
+            "rejected_count": len(updated_candidates) - cleared_count,
             "email_notifications": {
                 "sent": email_results["sent"],
                 "failed": email_results["failed"],
@@ -104,14 +109,11 @@ async def bulk_update_assessment_scores(process_id: str, score_threshold: int =
     """
     try:
         # Get all applications for this process with Resume_shortlisted status
-        applications = await db_manager.get_collection("applications")
-        shortlisted_apps = []
-        
-        async for app in applications.find({
+        applications = db_manager.get_collection("applications")
+        shortlisted_apps = await applications.find({
             "process_id": process_id,
             "status": "Resume_shortlisted"
-        }):
-            shortlisted_apps.append(app)
+        }, projection={"candidate_id": 1}).batch_size(CURSOR_BATCH_SIZE).to_list(length=None)
         
         if not shortlisted_apps:
             return {"message": "No shortlisted candidates found for assessment"}
@@ -142,44 +144,43 @@ async def process_oa_deadline(process_id: str) -> Dict[str, Any]:
     """Process OA deadline - evaluate OA results and send interview notifications."""
     try:
         # Get process data
-        processes = await db_manager.get_collection("Processes")
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
+        process_data = await get_process(process_id)
         
         if not process_data:
             return {"error": "Process not found"}
         
-        # Get candidates who took OA
-        applications = await db_manager.get_collection("applications")
-        candidates = await db_manager.get_collection("candidate")
+        # Candidates who took OA, joined with their name/email in one query
+        applications = db_manager.get_collection("applications")
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "oa_score": {"$exists": True}}, ("oa_score",), keep_unmatched=False
+        )
         
         oa_cleared_candidates = []
         oa_rejected_candidates = []
         
-        async for app in applications.find({
-            "process_id": process_id,
-            "oa_score": {"$exists": True}
-        }):
-            candidate = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
-            if candidate:
-                candidate_data = {
-                    "_id": app["candidate_id"],
-                    "name": candidate.get("name"),
-                    "email": candidate.get("email"),
-                    "oa_score": app.get("oa_score"),
-                    "status": "OA_cleared" if app.get("oa_score", 0) >= 60 else "OA_rejected"
-                }
-                
-                if candidate_data["status"] == "OA_cleared":
-                    oa_cleared_candidates.append(candidate_data)
-                else:
-                    oa_rejected_candidates.append(candidate_data)
-        
-        # Update statuses in database
-        for candidate in oa_cleared_candidates + oa_rejected_candidates:
-            await applications.update_one(
-                {"candidate_id": candidate["_id"], "process_id": process_id},
-                {"$set": {"status": candidate["status"], "updated_at": datetime.now(timezone.utc)}}
-            )
+        for app in await applications.aggregate(pipeline, batchSize=CURSOR_BATCH_SIZE).to_list(length=None):
+            candidate_data = {
+                "_id": app["candidate_id"],
+                "name": app["candidate"].get("name"),
+                "email": app["candidate"].get("email"),
+                "oa_score": app.get("oa_score"),
+                "status": "OA_cleared" if (app.get("oa_score") or 0) >= 60 else "OA_rejected"
+            }
+            
+            if candidate_data["status"] == "OA_cleared":
+                oa_cleared_candidates.append(candidate_data)
+            else:
+                oa_rejected_candidates.append(candidate_data)
+        
+        # Derive every status from its stored oa_score server-side in one write (MongoDB 4.2+)
+        await applications.update_many(
+            {"process_id": process_id, "oa_score": {"$exists": True}},
+            [{"$set": {
+                "status": {"$cond": [{"$gte": ["$oa_score", 60]}, "OA_cleared", "OA_rejected"]},
+                "updated_at": datetime.now(timezone.utc)
+            }}]
+        )
+        await invalidate_process_responses(process_id)
         
         # Send interview notifications to cleared candidates
         interview_date = process_data.get("offline_interview_date")
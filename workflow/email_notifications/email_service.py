@@ -3,7 +3,8 @@ Email Service Integration for Hiring Workflows.
 Provides functions to trigger emails based on workflow events.
 """
 
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Awaitable, Callable, Tuple
 from .email_workflow import (
     send_resume_shortlisted_email,
     send_online_assessment_cleared_email,
@@ -12,24 +13,49 @@ from .email_workflow import (
     send_interview_notification_email
 )
 
+# Configuration: Most emails in flight at once per notify_* call
+EMAIL_CONCURRENCY = 20
+
+
+async def _send_all(candidates: List[Any], send_one: Callable[[Any], Awaitable[Tuple[bool, Dict[str, Any]]]]) -> Dict[str, Any]:
+    """
+    Run send_one for every candidate, at most EMAIL_CONCURRENCY at a time, and
+    tally its (sent, detail) outcomes. Details keep the order of candidates.
+    """
+    semaphore = asyncio.Semaphore(EMAIL_CONCURRENCY)
+    
+    async def guarded(candidate):
+        async with semaphore:
+            return await send_one(candidate)
+    
+    outcomes = await asyncio.gather(*(guarded(candidate) for candidate in candidates))
+    
+    results = {"sent": 0, "failed": 0, "details": []}
+    for sent, detail in outcomes:
+        if sent:
+            results["sent"] += 1
+        else:
+            results["failed"] += 1
+        results["details"].append(detail)
+    return results
+
 
 async def notify_resume_results(candidates: List[Dict[str, Any]], process_name: str, process_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """Send email notifications for resume shortlisting results."""
-    results = {"sent": 0, "failed": 0, "details": []}
     
-    for candidate in candidates:
+    # OA date and process id are the same for every candidate, so format them once
+    oa_date = process_data.get("assessment_date") if process_data else "TBD"
+    if isinstance(oa_date, str):
+        oa_date_str = oa_date
+    else:
+        oa_date_str = oa_date.strftime("%Y-%m-%d %H:%M IST") if oa_date else "TBD"
+    process_id = process_data.get('_id', 'process_id') if process_data else 'process_id'
+    
+    async def send_one(candidate):
         try:
             if candidate["status"] == "Resume_shortlisted":
                 # Generate OA links for both localhost and Render
-                oa_date = process_data.get("assessment_date") if process_data else "TBD"
-                if isinstance(oa_date, str):
-                    oa_date_str = oa_date
-                else:
-                    oa_date_str = oa_date.strftime("%Y-%m-%d %H:%M IST") if oa_date else "TBD"
-                
-                process_id = process_data.get('_id', 'process_id') if process_data else 'process_id'
                 candidate_id = candidate['_id']
-                
                 localhost_link = f"http://localhost:8000/{candidate_id}/OA/{process_id}"
                 render_link = f"https://hiring-process-automation.onrender.com/{candidate_id}/OA/{process_id}"
                 
@@ -49,35 +75,28 @@ async def notify_resume_results(candidates: List[Dict[str, Any]], process_name:
                     process_name
                 )
             
-            if result["status"] == "success":
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append({
+            return result["status"] == "success", {
                 "candidate": candidate["name"],
                 "email": candidate["email"],
                 "status": result["status"],
                 "score": candidate["resume_match_score"]
-            })
+            }
             
         except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
+            return False, {
                 "candidate": candidate.get("name", "Unknown"),
                 "email": candidate.get("email", "Unknown"),
                 "status": "error",
                 "message": str(e)
-            })
+            }
     
-    return results
+    return await _send_all(candidates, send_one)
 
 
 async def notify_assessment_results(candidates: List[Dict[str, Any]], process_name: str) -> Dict[str, Any]:
     """Send email notifications for online assessment results."""
-    results = {"sent": 0, "failed": 0, "details": []}
     
-    for candidate in candidates:
+    async def send_one(candidate):
         try:
             if candidate["status"] == "OA_cleared":
                 result = await send_online_assessment_cleared_email(
@@ -93,35 +112,28 @@ async def notify_assessment_results(candidates: List[Dict[str, Any]], process_na
                     process_name
                 )
             
-            if result["status"] == "success":
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append({
+            return result["status"] == "success", {
                 "candidate": candidate["name"],
                 "email": candidate["email"],
                 "status": result["status"],
                 "score": candidate["oa_score"]
-            })
+            }
             
         except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
+            return False, {
                 "candidate": candidate.get("name", "Unknown"),
                 "email": candidate.get("email", "Unknown"),
                 "status": "error",
                 "message": str(e)
-            })
+            }
     
-    return results
+    return await _send_all(candidates, send_one)
 
 
 async def notify_interview_results(candidates: List[Dict[str, Any]], process_name: str) -> Dict[str, Any]:
     """Send email notifications for offline interview results."""
-    results = {"sent": 0, "failed": 0, "details": []}
     
-    for candidate in candidates:
+    async def send_one(candidate):
         try:
             if candidate["status"] == "Interview_cleared":
                 result = await send_offline_interview_cleared_email(
@@ -136,35 +148,28 @@ async def notify_interview_results(candidates: List[Dict[str, Any]], process_nam
                     process_name
                 )
             
-            if result["status"] == "success":
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append({
+            return result["status"] == "success", {
                 "candidate": candidate["name"],
                 "email": candidate["email"],
                 "status": result["status"]
-            })
+            }
             
         except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
+            return False, {
                 "candidate": candidate.get("name", "Unknown"),
                 "email": candidate.get("email", "Unknown"),
                 "status": "error",
                 "message": str(e)
-            })
+            }
     
-    return results
+    return await _send_all(candidates, send_one)
 
 
 async def send_interview_notifications(candidates: List[Dict[str, Any]], process_name: str, 
                                      interview_date: str, interview_time: str, company_address: str) -> Dict[str, Any]:
     """Send interview notification emails to OA cleared candidates."""
-    results = {"sent": 0, "failed": 0, "details": []}
     
-    for candidate in candidates:
+    async def send_one(candidate):
         try:
             result = await send_interview_notification_email(
                 candidate["email"],
@@ -175,100 +180,65 @@ async def send_interview_notifications(candidates: List[Dict[str, Any]], process
                 company_address
             )
             
-            if result["status"] == "success":
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append({
+            return result["status"] == "success", {
                 "candidate": candidate["name"],
                 "email": candidate["email"],
                 "status": result["status"],
                 "message": result["message"]
-            })
+            }
             
         except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
+            return False, {
                 "candidate": candidate.get("name", "Unknown"),
                 "email": candidate.get("email", "Unknown"),
                 "status": "error",
                 "message": f"Failed to send email: {str(e)}"
-            })
+            }
     
-    return results
+    return await _send_all(candidates, send_one)
 
 
 async def send_selection_notifications(selected_candidates: List[Dict[str, Any]], 
                                      rejected_candidates: List[Dict[str, Any]], 
                                      process_name: str, package_offered: str) -> Dict[str, Any]:
     """Send final selection and rejection emails."""
-    results = {"sent": 0, "failed": 0, "details": []}
     
-    # Send selection emails
-    for candidate in selected_candidates:
+    async def send_one(job):
+        email_type, candidate = job
         try:
-            result = await send_selection_email(
-                candidate["email"],
-                candidate["name"],
-                process_name,
-                package_offered
-            )
-            
-            if result["status"] == "success":
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append({
-                "candidate": candidate["name"],
-                "email": candidate["email"],
-                "status": result["status"],
-                "type": "selection"
-            })
-            
-        except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
-                "candidate": candidate.get("name", "Unknown"),
-                "email": candidate.get("email", "Unknown"),
-                "status": "error",
-                "type": "selection",
-                "message": str(e)
-            })
-    
-    # Send rejection emails
-    for candidate in rejected_candidates:
-        try:
-            result = await send_rejection_email(
-                candidate["email"],
-                candidate["name"],
-                process_name
-            )
-            
-            if result["status"] == "success":
-                results["sent"] += 1
+            if email_type == "selection":
+                result = await send_selection_email(
+                    candidate["email"],
+                    candidate["name"],
+                    process_name,
+                    package_offered
+                )
             else:
-                results["failed"] += 1
+                result = await send_rejection_email(
+                    candidate["email"],
+                    candidate["name"],
+                    process_name
+                )
             
-            results["details"].append({
+            return result["status"] == "success", {
                 "candidate": candidate["name"],
                 "email": candidate["email"],
                 "status": result["status"],
-                "type": "rejection"
-            })
+                "type": email_type
+            }
             
         except Exception as e:
-            results["failed"] += 1
-            results["details"].append({
+            return False, {
                 "candidate": candidate.get("name", "Unknown"),
                 "email": candidate.get("email", "Unknown"),
                 "status": "error",
-                "type": "rejection",
+                "type": email_type,
                 "message": str(e)
-            })
+            }
     
-    return results
+    # Selection emails first, then rejections, all sharing one concurrency limit
+    jobs = [("selection", c) for c in selected_candidates] + [("rejection", c) for c in rejected_candidates]
+    return await _send_all(jobs, send_one)
 
 
 async def send_selection_email(email: str, name: str, process_name: str, package_offered: str) -> Dict[str, Any]:
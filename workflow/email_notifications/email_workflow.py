@@ -4,16 +4,25 @@ Handles all email notifications with template-based system.
 """
 
 import os
-from typing import Dict, Any, Optional
+import string
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 
+_formatter = string.Formatter()
+
+
 class EmailWorkflow:
     """Unified email workflow for all hiring process stages."""
     
     def __init__(self):
         self.email_service = os.getenv("EMAIL_SERVICE", "sendgrid").lower()
         self.email_templates = self._load_templates()
+        # Parse each template once so sends only substitute fields
+        self._parsed = {
+            template_type: {part: list(_formatter.parse(text)) for part, text in template.items()}
+            for template_type, template in self.email_templates.items()
+        }
         self.sender = None
         self._setup_email_service()
     
@@ -149,9 +158,9 @@ Hiring Team
             if template_type not in self.email_templates:
                 return {"status": "error", "message": f"Template '{template_type}' not found"}
             
-            template = self.email_templates[template_type]
-            subject = template["subject"].format(**kwargs)
-            body = template["body"].format(**kwargs)
+            parsed = self._parsed[template_type]
+            subject = self._render(parsed["subject"], kwargs)
+            body = self._render(parsed["body"], kwargs)
             
             # Send email
             if self._is_email_configured():
@@ -177,6 +186,17 @@ Hiring Team
                 "template": template_type
             }
     
+    @staticmethod
+    def _render(parsed: List[Tuple], values: Dict[str, Any]) -> str:
+        """Fill a pre-parsed template; same output as str.format for plain {name} fields."""
+        parts = []
+        for literal, field_name, format_spec, conversion in parsed:
+            parts.append(literal)
+            if field_name is not None:
+                value = _formatter.convert_field(values[field_name], conversion)
+                parts.append(format(value, format_spec))
+        return "".join(parts)
+    
     def _setup_email_service(self):
         """Setup email service based on configuration."""
         if self.email_service == "sendgrid":
@@ -203,6 +223,13 @@ Hiring Team
 email_workflow = EmailWorkflow()
 
 
+async def close_email_sender():
+    """Release the email sender's connections (the SendGrid HTTP client or Gmail SMTP session)."""
+    close = getattr(email_workflow.sender, "close", None)
+    if close:
+        await close()
+
+
 # Unified functions for different hiring stages
 async def send_resume_shortlisted_email(candidate_email: str, candidate_name: str, 
                                       process_name: str, score: int, localhost_link: str = "TBD", 
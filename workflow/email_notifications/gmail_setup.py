@@ -3,6 +3,7 @@ Gmail SMTP Setup for Free Email Sending.
 Uses Gmail's free SMTP service with App Passwords.
 """
 
+import asyncio
 import smtplib
 import os
 from email.mime.text import MIMEText
@@ -17,6 +18,49 @@ class GmailSender:
         self.smtp_port = 587
         self.username = os.getenv("GMAIL_USERNAME")  # your-email@gmail.com
         self.password = os.getenv("GMAIL_APP_PASSWORD")  # 16-character app password
+        # One logged-in SMTP session reused across sends; the lock keeps sends on it one at a time
+        self._conn = None
+        self._lock = asyncio.Lock()
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open a logged-in SMTP session (TCP + STARTTLS + AUTH)."""
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _drop_conn(self):
+        """Discard the cached session after an error so the next send reconnects."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+    
+    def _send_message(self, msg: MIMEMultipart):
+        """Send on the cached session, reconnecting once if Gmail dropped it while idle."""
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._conn.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._conn = self._connect()
+            self._conn.send_message(msg)
+    
+    async def close(self):
+        """Log out of the cached SMTP session; call on app shutdown."""
+        async with self._lock:
+            if self._conn is not None:
+                try:
+                    await asyncio.to_thread(self._conn.quit)
+                except Exception:
+                    pass
+                self._conn = None
     
     async def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """Send email via Gmail SMTP."""
@@ -32,10 +76,16 @@ class GmailSender:
             msg['Subject'] = subject
             msg.attach(MIMEText(body, 'plain'))
             
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            async with self._lock:
+                try:
+                    # smtplib blocks, so run the SMTP conversation off the event loop
+                    await asyncio.to_thread(self._send_message, msg)
+                except smtplib.SMTPRecipientsRefused:
+                    # Only this recipient failed; the session is still usable
+                    raise
+                except Exception:
+                    self._drop_conn()
+                    raise
             
             print(f"Email sent successfully to: {to_email}")
             return True
@@ -3,9 +3,34 @@ SendGrid Email Service for Render Deployment.
 Uses SendGrid API instead of SMTP for reliable email delivery.
 """
 
+import asyncio
 import os
-import sendgrid
-from sendgrid.helpers.mail import Mail
+import random
+import time
+from typing import Optional
+import httpx
+
+
+# SendGrid v3 mail endpoint
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+# Configuration: Connection pool for the shared client. Kept-alive connections let
+# consecutive emails skip the TCP+TLS handshake; the per-host cap stays under
+# SendGrid's throttles.
+SENDGRID_LIMITS = httpx.Limits(max_connections=30, max_keepalive_connections=30, keepalive_expiry=75)
+SENDGRID_TIMEOUT = 10.0
+
+# Configuration: Attempts per email on transient failures (network errors, 429, 5xx),
+# with exponential backoff plus jitter between them
+SENDGRID_RETRY_ATTEMPTS = 3
+SENDGRID_RETRY_BASE = 0.2
+SENDGRID_RETRY_MAX = 2.0
+SENDGRID_RETRYABLE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+# Configuration: After this many emails in a row fail transiently, skip sending
+# for SENDGRID_BREAKER_RESET seconds instead of piling more requests onto an outage
+SENDGRID_BREAKER_FAIL_MAX = 20
+SENDGRID_BREAKER_RESET = 30
 
 
 class SendGridSender:
@@ -14,7 +39,34 @@ class SendGridSender:
     def __init__(self):
         self.api_key = os.getenv("SENDGRID_API_KEY")
         self.from_email = os.getenv("FROM_EMAIL", "noreply@yourdomain.com")
-        self.sg = sendgrid.SendGridAPIClient(api_key=self.api_key)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Circuit breaker state, shared by every concurrent send
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use (inside the running event loop)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=SENDGRID_LIMITS,
+                timeout=SENDGRID_TIMEOUT
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client; call on app shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _record_transient_failure(self):
+        """Count an email that exhausted its retries; open the circuit at SENDGRID_BREAKER_FAIL_MAX."""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= SENDGRID_BREAKER_FAIL_MAX:
+            self._open_until = time.monotonic() + SENDGRID_BREAKER_RESET
+            self._consecutive_failures = 0
+            print(f"SendGrid circuit opened for {SENDGRID_BREAKER_RESET}s after repeated failures")
     
     async def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """Send email via SendGrid API."""
@@ -24,21 +76,38 @@ class SendGridSender:
                 print(f"Invalid email format: {to_email}")
                 return False
             
-            message = Mail(
-                from_email=self.from_email,
-                to_emails=to_email,
-                subject=subject,
-                html_content=body
-            )
+            if time.monotonic() < self._open_until:
+                print(f"SendGrid circuit open, skipping email to: {to_email}")
+                return False
             
-            response = self.sg.send(message)
+            message = {
+                "personalizations": [{"to": [{"email": to_email}]}],
+                "from": {"email": self.from_email},
+                "subject": subject,
+                "content": [{"type": "text/html", "value": body}]
+            }
             
-            if response.status_code == 202:
-                print(f"Email sent successfully to: {to_email}")
-                return True
-            else:
-                print(f"SendGrid error: {response.status_code}")
-                return False
+            for attempt in range(SENDGRID_RETRY_ATTEMPTS):
+                try:
+                    response = await self._get_client().post(SENDGRID_SEND_URL, json=message)
+                except httpx.TransportError as e:
+                    print(f"SendGrid request error (attempt {attempt + 1}): {e}")
+                else:
+                    if response.status_code == 202:
+                        self._consecutive_failures = 0
+                        print(f"Email sent successfully to: {to_email}")
+                        return True
+                    print(f"SendGrid error: {response.status_code}")
+                    if response.status_code not in SENDGRID_RETRYABLE_STATUS:
+                        # Rejected request (bad address, auth...), retrying won't help
+                        return False
+                
+                if attempt < SENDGRID_RETRY_ATTEMPTS - 1:
+                    delay = min(SENDGRID_RETRY_MAX, SENDGRID_RETRY_BASE * 2 ** attempt)
+                    await asyncio.sleep(delay + random.random() * SENDGRID_RETRY_BASE)
+            
+            self._record_transient_failure()
+            return False
                 
         except Exception as e:
             print(f"SendGrid send failed to {to_email}: {e}")
@@ -52,5 +121,5 @@ class SendGridSender:
 3. Add to .env file:
    SENDGRID_API_KEY=your_sendgrid_api_key
    FROM_EMAIL=noreply@yourdomain.com
-4. Install dependency: pip install sendgrid
+4. Install dependency: pip install httpx
 """
\ No newline at end of file
@@ -6,8 +6,12 @@ Handles final candidate selection based on combined scores and sends selection e
 from typing import Dict, List, Any
 from datetime import datetime, timezone
 from db_manager import db_manager
-from bson import ObjectId
+from pymongo import UpdateOne
+from workflow.assessment_workflow import CURSOR_BATCH_SIZE
 from workflow.email_notifications.email_service import send_selection_notifications
+from workflow.process_cache import get_process
+from middleware.aggregation import with_candidate_pipeline
+from middleware.response_cache import invalidate_process_responses
 
 
 async def process_final_shortlisting(process_id: str) -> Dict[str, Any]:
@@ -16,24 +20,27 @@ async def process_final_shortlisting(process_id: str) -> Dict[str, Any]:
     This runs automatically on the interview deadline.
     """
     try:
-        processes = await db_manager.get_collection("Processes")
-        candidates = await db_manager.get_collection("candidate")
-        applications = await db_manager.get_collection("applications")
+        applications = db_manager.get_collection("applications")
         
         # Get process data
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
+        process_data = await get_process(process_id)
         if not process_data:
             return {"error": "Process not found"}
         
-        # Get OA cleared candidates with all scores
+        # OA cleared applications with all scores, joined with the candidate's name/email in one query
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "status": "OA_cleared", "hr_score": {"$exists": True}},
+            ("oa_score", "tech_score", "hr_score")
+        )
+        apps = await applications.aggregate(pipeline, batchSize=CURSOR_BATCH_SIZE).to_list(length=None)
+        
         selected_candidates = []
         rejected_candidates = []
+        # One timestamp for the whole run
+        now = datetime.now(timezone.utc)
+        ops = []
         
-        async for app in applications.find({
-            "process_id": process_id,
-            "status": "OA_cleared",
-            "hr_score": {"$exists": True}
-        }):
+        for app in apps:
             oa_score = app.get("oa_score", 0)
             tech_score = app.get("tech_score", 0)
             hr_score = app.get("hr_score", 0)
@@ -44,18 +51,17 @@ async def process_final_shortlisting(process_id: str) -> Dict[str, Any]:
             # Final selection threshold: 70
             new_status = "Final_selected" if combined_score >= 70 else "Final_rejected"
             
-            # Update application status
-            await applications.update_one(
+            ops.append(UpdateOne(
                 {"_id": app["_id"]},
                 {"$set": {
                     "status": new_status,
                     "final_score": combined_score,
-                    "updated_at": datetime.now(timezone.utc)
+                    "updated_at": now
                 }}
-            )
+            ))
             
-            # Get candidate details
-            candidate = await candidates.find_one({"_id": ObjectId(app["candidate_id"])})
+            # Candidate details (applications without a candidate are updated but not emailed)
+            candidate = app.get("candidate")
             if candidate:
                 candidate_data = {
                     "_id": app["candidate_id"],
@@ -70,6 +76,11 @@ async def process_final_shortlisting(process_id: str) -> Dict[str, Any]:
                 else:
                     rejected_candidates.append(candidate_data)
         
+        # Update all applications in one round-trip
+        if ops:
+            await applications.bulk_write(ops, ordered=False)
+            await invalidate_process_responses(process_id)
+        
         # Send email notifications
         process_name = process_data.get("process_name", "Unknown Position")
         package_offered = process_data.get("package_offered", "Competitive package")
@@ -102,7 +113,7 @@ async def process_interview_deadline(process_id: str) -> Dict[str, Any]:
     """Process interview deadline - trigger final shortlisting."""
     try:
         # Check if HR has provided scores for OA cleared candidates
-        applications = await db_manager.get_collection("applications")
+        applications = db_manager.get_collection("applications")
         
         # Count OA cleared candidates
         oa_cleared_count = await applications.count_documents({
@@ -6,8 +6,10 @@ Handles scoring and email notifications for offline interviews.
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 from db_manager import db_manager
-from bson import ObjectId
+from pymongo import UpdateOne
 from workflow.email_notifications.email_service import notify_interview_results
+from workflow.process_cache import get_process
+from middleware.aggregation import with_candidate_pipeline
 
 
 async def process_interview_results(process_id: str, interview_results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -23,32 +25,40 @@ async def process_interview_results(process_id: str, interview_results: List[Dic
     """
     try:
         # Get process data
-        processes = await db_manager.get_collection("Processes")
-        process_data = await processes.find_one({"_id": ObjectId(process_id)})
+        process_data = await get_process(process_id)
         
         if not process_data:
             return {"error": "Process not found"}
         
-        # Get applications and candidates
-        applications = await db_manager.get_collection("applications")
-        candidates = await db_manager.get_collection("candidate")
+        applications = db_manager.get_collection("applications")
         
-        updated_candidates = []
-        update_count = 0
+        # Latest scores per candidate (a repeated candidate_id keeps its last result)
+        scores = {
+            result["candidate_id"]: (result.get("tech_score", 0), result.get("hr_score", 0))
+            for result in interview_results
+        }
         
-        for result in interview_results:
-            candidate_id = result["candidate_id"]
-            tech_score = result.get("tech_score", 0)
-            hr_score = result.get("hr_score", 0)
-            
+        # Applications that exist, joined with the candidate's name/email in one query.
+        # Every matched application is modified (updated_at always changes).
+        pipeline = with_candidate_pipeline(
+            {"process_id": process_id, "candidate_id": {"$in": list(scores)}}, (), keep_unmatched=False
+        )
+        matched = await applications.aggregate(pipeline).to_list(None)
+        
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        ops = []
+        results = {}
+        
+        for candidate_id, (tech_score, hr_score) in scores.items():
             # Calculate overall interview score (weighted average)
             overall_score = (tech_score * 0.7) + (hr_score * 0.3)
             
             # Determine status based on overall score (threshold: 70)
             new_status = "Interview_cleared" if overall_score >= 70 else "Interview_rejected"
+            results[candidate_id] = (overall_score, new_status)
             
-            # Update application in database
-            update_result = await applications.update_one(
+            ops.append(UpdateOne(
                 {
                     "candidate_id": candidate_id,
                     "process_id": process_id
@@ -58,26 +68,34 @@ async def process_interview_results(process_id: str, interview_results: List[Dic
                         "tech_score": tech_score,
                         "hr_score": hr_score,
                         "status": new_status,
-                        "updated_at": datetime.now(timezone.utc)
+                        "updated_at": now
                     }
                 }
-            )
-            
-            if update_result.modified_count > 0:
-                update_count += 1
-                
-                # Get candidate details for email
-                candidate = await candidates.find_one({"_id": ObjectId(candidate_id)})
-                if candidate:
-                    updated_candidates.append({
-                        "_id": candidate_id,
-                        "name": candidate.get("name"),
-                        "email": candidate.get("email"),
-                        "tech_score": tech_score,
-                        "hr_score": hr_score,
-                        "overall_score": overall_score,
-                        "status": new_status
-                    })
+            ))
+        
+        # Update all applications in one round-trip
+        update_count = 0
+        if ops:
+            bulk_result = await applications.bulk_write(ops, ordered=False)
+            update_count = bulk_result.modified_count
+        
+        # Candidate details for email
+        updated_candidates = []
+        cleared_count = 0
+        for app in matched:
+            candidate_id = app["candidate_id"]
+            tech_score, hr_score = scores[candidate_id]
+            overall_score, new_status = results[candidate_id]
+            cleared_count += new_status == "Interview_cleared"
+            updated_candidates.append({
+                "_id": candidate_id,
+                "name": app["candidate"].get("name"),
+                "email": app["candidate"].get("email"),
+                "tech_score": tech_score,
+                "hr_score": hr_score,
+                "overall_score": overall_score,
+                "status": new_status
+            })
         
         # Send email notifications
         process_name = process_data.get("process_name", "Unknown Position")
@@ -87,8 +105,8 @@ async def process_interview_results(process_id: str, interview_results: List[Dic
             "status": "success",
             "total_processed": len(interview_results),
             "updated_count": update_count,
-            "cleared_count": len([c for c in updated_candidates if c["status"] == "Interview_cleared"]),
-            "rejected_count": len([c for c in updated_candidates if c["status"] == "Interview_rejected"]),
+            "cleared_count": cleared_count,
+            "rejected_count": len(updated_candidates) - cleared_count,
             "email_notifications": {
                 "sent": email_results["sent"],
                 "failed": email_results["failed"],
@@ -110,7 +128,7 @@ async def bulk_update_interview_scores(process_id: str, score_threshold: int = 7
     """
     try:
         # Get all applications for this process with OA_cleared status
-        applications = await db_manager.get_collection("applications")
+        applications = db_manager.get_collection("applications")
         cleared_apps = []
         
         async for app in applications.find({
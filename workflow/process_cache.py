@@ -0,0 +1,63 @@
+"""
+Short-lived in-memory cache of process documents, shared by the workflows and the OA pages.
+Processes only change on HR edits, so a process is read from MongoDB at most
+once per PROCESS_CACHE_TTL seconds.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from db_manager import db_manager
+from middleware.validation import to_object_id
+
+
+# Configuration: Seconds a cached process is reused, and the most processes kept
+PROCESS_CACHE_TTL = 30
+PROCESS_CACHE_MAXSIZE = 512
+
+# Process fields the workflows and OA pages read (job_description is left out on purpose)
+PROCESS_FIELDS = ("process_name", "package_offered", "hr_id", "resume_deadline",
+                  "assessment_date", "offline_interview_date")
+
+# process_id -> (expires at, process document); missing processes aren't cached
+_cache: Dict[str, Any] = {}
+
+# process_id -> lock, so concurrent misses for one process share a single read;
+# dropped once the read finishes
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_process(process_id: str) -> Optional[dict]:
+    """Fetch a process's workflow fields, cached for PROCESS_CACHE_TTL seconds; None if missing."""
+    cached = _cache.get(process_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    object_id = to_object_id(process_id, "Invalid process id")
+    lock = _locks.setdefault(process_id, asyncio.Lock())
+    try:
+        async with lock:
+            # Another caller may have filled the entry while we waited
+            cached = _cache.get(process_id)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            processes = db_manager.get_collection("Processes")
+            process_data = await processes.find_one(
+                {"_id": object_id},
+                projection={field: 1 for field in PROCESS_FIELDS}
+            )
+            if process_data:
+                if len(_cache) >= PROCESS_CACHE_MAXSIZE:
+                    _cache.clear()
+                _cache[process_id] = (time.monotonic() + PROCESS_CACHE_TTL, process_data)
+        return process_data
+    finally:
+        # Waiters already hold this lock object, so it can go once its read is done
+        if _locks.get(process_id) is lock:
+            del _locks[process_id]
+
+
+def invalidate_process(process_id: str):
+    """Drop a cached process; call after HR edits or deletes it."""
+    _cache.pop(process_id, None)
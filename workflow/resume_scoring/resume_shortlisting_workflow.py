@@ -16,6 +16,7 @@ from bson import ObjectId
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 from workflow.email_notifications.email_service import notify_resume_results
+from middleware.response_cache import invalidate_process_responses
 load_dotenv()
 
 class HiringState(TypedDict):
@@ -49,7 +50,7 @@ async def check_deadline_and_load_candidates(state: HiringState) -> HiringState:
         print(f"📋 T6: STAGE 1 Loading candidates at {datetime.now()}")
         
         # Get process data
-        processes = await db_manager.get_collection("Processes")
+        processes = db_manager.get_collection("Processes")
         try:
             proc = await processes.find_one({"_id": ObjectId(process_id)})
         except Exception:
@@ -71,8 +72,8 @@ async def check_deadline_and_load_candidates(state: HiringState) -> HiringState:
         print(f"✅ STAGE 1: Process found - {proc.get('process_name', 'Unknown')}")
         
         # Load all applications for this process
-        applications = await db_manager.get_collection("applications")
-        candidates = await db_manager.get_collection("candidate")
+        applications = db_manager.get_collection("applications")
+        candidates = db_manager.get_collection("candidate")
         candidate_list = []
         
         async for app in applications.find({"process_id": process_id}):
@@ -206,7 +207,7 @@ async def update_database(state: HiringState) -> HiringState:
             }
         
         # Update applications in database
-        applications = await db_manager.get_collection("applications")
+        applications = db_manager.get_collection("applications")
         updated_count = 0
         failed_updates = []
         
@@ -456,6 +457,7 @@ async def run_resume_scoring_workflow(process_id: str, trigger_type: str = "MANU
         print(f"⏳ T4: Starting execution at {datetime.now()}")
         result = await app.ainvoke(initial_state)
         print(f"🎉 T5: WORKFLOW COMPLETE at {datetime.now()}")
+        await invalidate_process_responses(process_id)
         return result
         
     except Exception as e: